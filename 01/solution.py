@@ -1,21 +1,79 @@
-from itertools import cycle
+from aoc.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+CHUNK_SIZE = 1 << 22  # characters parsed at a time, large files never exist as a list of Python ints
 
 
 def read_input(filename):
     with open(filename) as f:
-        return [int(line) for line in f]
+        return np.concatenate([np.zeros(0, dtype=np.int64)] + list(_read_chunks(f)))
+
+
+def generate_input(size, rng):
+    """`size` frequency changes adding up to 0, so solution2 always finds a repeat"""
+    values = [rng.choice((-1, 1)) * rng.randint(1, 20) for _ in range(size - 1)]
+    values.append(-sum(values))
+    return '\n'.join('%+d' % v for v in values) + '\n'
 
 
 def solution1(values):
-    return sum(values)
+    return int(np.sum(values, dtype=np.int64))
 
 
 def solution2(values):
-    known_sums = set()
-    s = 0
-    for v in cycle(values):
-        s += v
-        if s in known_sums:
-            return s
-        else:
-            known_sums.add(s)
+    repeat = _first_repeat(np.cumsum(values, dtype=np.int64))
+    if repeat is None:
+        return 'No frequency is reached twice'
+    return repeat
+
+
+def _read_chunks(f):
+    """The changes of an open file as int64 arrays of about CHUNK_SIZE characters each"""
+    rest = ''
+    while True:
+        text = f.read(CHUNK_SIZE)
+        if not text:
+            break
+        text = rest + text
+        cut = text.rfind('\n') + 1
+        text, rest = text[:cut], text[cut:]
+        yield np.fromstring(text, dtype=np.int64, sep=' ')
+    yield np.fromstring(rest, dtype=np.int64, sep=' ')
+
+
+def _first_repeat(sums):
+    """The first of the running sums reached twice while the changes are applied over and over, None if none is
+
+    Pass k reaches sums[i] + k * drift. Unless a sum repeats within the first pass, sums[i] comes back only
+    through a sum of the same residue modulo the drift that lies (passes * drift) behind it, so comparing the
+    neighbours of each residue class sorted along the drift finds the earliest repeat without simulating passes.
+    """
+    if not len(sums):
+        return None
+    order = np.argsort(sums, kind='stable')
+    repeated = order[1:][sums[order[1:]] == sums[order[:-1]]]
+    if len(repeated):
+        return int(sums[repeated.min()])
+    drift = int(sums[-1])
+    if drift == 0:
+        return int(sums[0])
+    ahead = sums if drift > 0 else -sums
+    residues = ahead % abs(drift)
+    order = np.lexsort((ahead, residues))
+    behind, after = order[:-1], order[1:]
+    neighbours = residues[behind] == residues[after]
+    if not neighbours.any():
+        return None
+    behind, after = behind[neighbours], after[neighbours]
+    passes = (ahead[after] - ahead[behind]) // abs(drift)
+    first = np.lexsort((behind, passes))[0]
+    return int(sums[after[first]])
+
+
+def test_solution2():
+    assert 1 == solution2([+1, -1])
+    assert 10 == solution2([+3, +3, +4, -2, -4])
+    assert 5 == solution2([-6, +3, +8, +5, -6])
+    assert 14 == solution2([+7, +7, -2, -7, -4])
+    assert 'No frequency is reached twice' == solution2([+1, +2])
@@ -1,5 +1,17 @@
-from collections import Counter
-from functools import reduce
+import os
+import random
+import string
+import tempfile
+
+from aoc import hamming
+from aoc.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+LETTERS = len(string.ascii_lowercase)
+COUNT_BLOCK = 1 << 16  # ids whose letters are counted at a time
+HASH_BASE = 256
+HASH_MODULUS = (1 << 61) - 1  # a Mersenne prime, masked hashes stay below 2 ** 61 and the id length goes above
 
 
 def read_input(filename):
@@ -7,32 +19,123 @@ def read_input(filename):
         return [line.strip() for line in f]
 
 
+def read_index(filename, k):
+    """The box ids of `filename` in an index answering "all ids within k differences" queries"""
+    return hamming.Index(read_input(filename), k)
+
+
+def generate_input(size, rng, length=26):
+    """`size` random box ids, exactly one pair of them differs by one character"""
+    box_ids = [''.join(rng.choice(string.ascii_lowercase) for _ in range(length)) for _ in range(size - 1)]
+    twin = list(rng.choice(box_ids))
+    i = rng.randrange(length)
+    twin[i] = rng.choice(string.ascii_lowercase.replace(twin[i], ''))
+    box_ids.insert(rng.randrange(len(box_ids) + 1), ''.join(twin))
+    return '\n'.join(box_ids)
+
+
 def solution1(box_ids):
-    twos = 0
-    threes = 0
-    for box_id in box_ids:
-        c = Counter(box_id)
-        p = reduce(lambda x, y: x*y, c.values(), 1)
-        twos += p % 2 == 0
-        threes += p % 3 == 0
+    counts = _letter_counts(box_ids)
+    twos = int((counts == 2).any(axis=1).sum())
+    threes = int((counts == 3).any(axis=1).sum())
     return twos * threes
 
 
 def solution2(box_ids):
-    for i in range(0, len(box_ids) - 1):
-        box_i = box_ids[i]
+    # ids differing in one character collide once that character is masked out, one position at a time;
+    # masking subtracts the character from a polynomial hash of the id, O(1) per id and position
+    hashes = [_hash(box_id) for box_id in box_ids]
+    longest = max(map(len, box_ids), default=0)
+    weights = [pow(HASH_BASE, k, HASH_MODULUS) for k in range(longest)]
+    first = None
+    for position in range(longest):
+        pair = _first_pair_differing_at(box_ids, hashes, weights, position)
+        if pair and (first is None or pair < first):
+            first = pair
+    if first:
+        i, j = first
+        box_i, box_j = box_ids[i], box_ids[j]
+        common = ''.join(ci for ci, cj in zip(box_i, box_j) if ci == cj)
+        return 'common string: %s (box %d: %s and box %d: %s)' % (common, i, box_i, j, box_j)
+
+
+def _letter_counts(box_ids):
+    """(ids x 26) matrix of how often each lowercase letter occurs in each id"""
+    if not box_ids:
+        return np.zeros((0, LETTERS), dtype=np.uint8)
+    # fixed width bytes padded with NUL, which like any other non letter is not counted; the ids stay one byte per
+    # character, a count never exceeds the width and only a block of rows at a time is widened for np.bincount
+    letters = np.array(box_ids, dtype=bytes).view(np.uint8).reshape(len(box_ids), -1)
+    counts = np.empty((len(box_ids), LETTERS), dtype=np.min_scalar_type(letters.shape[1]))
+    for start in range(0, len(box_ids), COUNT_BLOCK):
+        block = letters[start:start + COUNT_BLOCK]
+        known = (block >= ord('a')) & (block < ord('a') + LETTERS)
+        cells = block.astype(np.intp) + (np.arange(len(block))[:, None] * LETTERS - ord('a'))
+        histograms = np.bincount(cells[known], minlength=len(block) * LETTERS)
+        counts[start:start + len(block)] = histograms.reshape(len(block), LETTERS)
+    return counts
+
+
+def _first_pair_differing_at(box_ids, hashes, weights, position):
+    """First pair (i, j), in the order of a pairwise scan, of ids differing only at `position`"""
+    firsts = {}
+    first = None
+    for j, box_id in enumerate(box_ids):
+        length = len(box_id)
+        if length <= position:
+            continue
+        masked = (hashes[j] - ord(box_id[position]) * weights[length - 1 - position]) % HASH_MODULUS
+        i = firsts.setdefault(masked + (length << 61), j)
+        # an id equal at position too is a copy of box_ids[i], not a near duplicate; the string
+        # comparison only runs for a better pair and guards against a hash collision
+        if (
+            box_ids[i][position] != box_id[position] and (first is None or i < first[0]) and
+            box_ids[i][:position] == box_id[:position] and box_ids[i][position + 1:] == box_id[position + 1:]
+        ):
+            first = (i, j)
+    return first
+
+
+def _hash(box_id):
+    # the bytes of the id are its digits in base 256
+    return int.from_bytes(box_id.encode('latin-1'), 'big') % HASH_MODULUS
+
+
+def test_solution1():
+    assert 12 == solution1(['abcdef', 'bababc', 'abbcde', 'abcccd', 'aabcdd', 'abcdee', 'ababab'])
+    # a letter four or six times is neither a two nor a three
+    assert 0 == solution1(['aaaa', 'aaaaaa'])
+    assert 1 == solution1(['aabbbcccc'])
+
+
+def test_solution2():
+    sample = ['abcde', 'fghij', 'klmno', 'pqrst', 'fguij', 'axcye', 'wvxyz']
+    assert 'common string: fgij (box 1: fghij and box 4: fguij)' == solution2(sample)
+    assert None is solution2(['abc', 'abc', 'xyz'])
+    # copies are no near duplicates; (2, 4) and (0, 5) differ at position 0, but the pairwise scan meets (0, 3) first
+    ids = ['abcd', 'abcd', 'qrst', 'abcx', 'xrst', 'xbcd', 'ab']
+    assert 'common string: abc (box 0: abcd and box 3: abcx)' == solution2(ids) == _pairwise_scan(ids)
+    rng = random.Random(0)
+    for _ in range(200):
+        ids = [''.join(rng.choice('abc') for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(2, 12))]
+        assert solution2(ids) == _pairwise_scan(ids), ids
+
+
+def _pairwise_scan(box_ids):
+    for i, box_i in enumerate(box_ids):
         for j in range(i + 1, len(box_ids)):
             box_j = box_ids[j]
-            if diff_1(box_i, box_j):
+            if len(box_i) == len(box_j) and hamming.distance(box_i, box_j) == 1:
                 common = ''.join(ci for ci, cj in zip(box_i, box_j) if ci == cj)
                 return 'common string: %s (box %d: %s and box %d: %s)' % (common, i, box_i, j, box_j)
 
 
-def diff_1(bi, bj):
-    c = 0
-    for i, j in zip(bi, bj):
-        if i != j:
-            c += 1
-        if c > 1:
-            return False
-    return c == 1
+def test_read_index():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'input.txt')
+        with open(filename, 'w') as f:
+            f.write('abcde\nfghij\nklmno\npqrst\nfguij\naxcye\nwvxyz\n')
+        index = read_index(filename, 1)
+    assert 'fguij' == index.words[4]
+    assert [1, 4] == index.query('fghij')
+    assert [(1, 4, 1)] == list(index.pairs())
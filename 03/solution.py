@@ -1,32 +1,32 @@
-import re
-import numpy as np
+from aoc import columns, progress
+from aoc.lazy import lazy_import
 
-pat = re.compile('#(?P<cid>\d+) @ (?P<lx>\d+),(?P<ly>\d+): (?P<dx>\d+)x(?P<dy>\d+)')
-N = 1000
-cloth = np.zeros((N, N))
+np = lazy_import('numpy')
 
-STATE = {}
+N = 1000
 
 
 def read_input(filename):
-    claims = []
-    with open(filename) as f:
-        for line in f:
-            m = re.match(pat, line)
-            claim_id = int(m.group('cid'))
-            lx = int(m.group('lx'))
-            ly = int(m.group('ly'))
-            dx = int(m.group('dx'))
-            dy = int(m.group('dy'))
-            claims.append((claim_id, lx, ly, lx + dx, ly + dy))
-    return claims
-
-
-def solution1(claims):
-    global STATE
+    return columns.read_integers(filename, ('cid', 'lx', 'ly', 'dx', 'dy'))
+
+
+def generate_input(size, rng):
+    """`size` claims of up to 30x30 inches anywhere on the cloth"""
+    lines = []
+    for claim_id in range(1, size + 1):
+        dx, dy = rng.randint(5, 30), rng.randint(5, 30)
+        lines.append('#%d @ %d,%d: %dx%d' % (claim_id, rng.randrange(N - dx), rng.randrange(N - dy), dx, dy))
+    return '\n'.join(lines) + '\n'
+
+
+def shared_state(claims):
+    """Lay every claim on the cloth: the overlapping inches and which claims overlap, both parts read it"""
+    cloth = np.zeros((N, N))
     overlap_ids = set()
     non_overlap_ids = set()
-    for cid, lx, ly, rx, ry in claims:
+    for n, (cid, lx, ly, dx, dy) in enumerate(claims.tolist(), start=1):
+        progress.checkpoint(claims=n)
+        rx, ry = lx + dx, ly + dy
         overlap = False
         for i in range(lx, rx):
             for j in range(ly, ry):
@@ -40,13 +40,19 @@ def solution1(claims):
         if not overlap:
             non_overlap_ids.add(cid)
     c = 0
-    STATE['non_overlap_ids'] = non_overlap_ids
-    STATE['overlap_ids'] = overlap_ids
     for x in cloth.flat:
         if x == -1:
             c += 1
-    return c
+    return {'overlapping_inches': c, 'non_overlap_ids': non_overlap_ids, 'overlap_ids': overlap_ids}
+
+
+def solution1(claims, state=None):
+    if state is None:
+        state = shared_state(claims)
+    return state['overlapping_inches']
 
 
-def solution2(claims):
-    return STATE['non_overlap_ids'].difference(STATE['overlap_ids'])
+def solution2(claims, state=None):
+    if state is None:
+        state = shared_state(claims)
+    return state['non_overlap_ids'].difference(state['overlap_ids'])
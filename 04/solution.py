@@ -1,6 +1,7 @@
 import re
 
 from collections import Counter
+from datetime import date, timedelta
 
 
 pat = re.compile('\[(?P<date>\d{4}-\d{2}-\d{2}) (?P<h>\d{2}):(?P<m>\d{2})\] (?P<event>.+)')
@@ -29,6 +30,24 @@ def read_input(filename):
     return guard_journal
 
 
+def generate_input(size, rng):
+    """`size` shifts of about sqrt(size) guards, each one falling asleep a few times after midnight"""
+    guards = rng.sample(range(10, 10000), max(1, int(size ** 0.5)))
+    first_day = date(1518, 1, 1)
+    lines = []
+    for i in range(size):
+        day = (first_day + timedelta(days=i)).isoformat()
+        lines.append('[%s 00:00] Guard #%d begins shift' % (day, rng.choice(guards)))
+        minute = rng.randint(1, 20)
+        while minute < 58 and rng.random() < 0.7:
+            wake_up = rng.randint(minute + 1, 59)
+            lines.append('[%s 00:%02d] falls asleep' % (day, minute))
+            lines.append('[%s 00:%02d] wakes up' % (day, wake_up))
+            minute = wake_up + rng.randint(1, 10)
+    rng.shuffle(lines)
+    return '\n'.join(lines)
+
+
 def _parse(line):
     m = re.match(pat, line)
     if not m:
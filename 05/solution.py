@@ -1,11 +1,24 @@
 import string
 
+INDEPENDENT_PARTS = True
+
 
 def read_input(filename):
     with open(filename) as f:
         return [c for c in f.read()]
 
 
+def generate_input(size, rng, reactivity=0.3):
+    """polymer of `size` units, about `reactivity` of them react with their left neighbour"""
+    polymer = []
+    for _ in range(size):
+        if polymer and rng.random() < reactivity:
+            polymer.append(polymer[-1].swapcase())
+        else:
+            polymer.append(rng.choice(string.ascii_letters))
+    return ''.join(polymer)
+
+
 def solution1(polymer):
     reduced_polymer = _reduce(list(polymer))
     return len(reduced_polymer)
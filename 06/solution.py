@@ -1,5 +1,9 @@
+import math
+
 from collections import defaultdict
 
+INDEPENDENT_PARTS = True
+
 
 def read_input(filename):
     points = []
@@ -16,6 +20,18 @@ def read_input(filename):
     return {'maxx': maxx, 'maxy': maxy, 'points': points}
 
 
+def generate_input(size, rng, extent=None):
+    """`size` distinct coordinates in a `extent` x `extent` square, by default one that grows with size"""
+    if extent is None:
+        extent = max(400, 2 * math.isqrt(size) + 10)
+    if size > (extent - 9) ** 2:
+        raise ValueError('only %d distinct coordinates fit between 10 and %d' % ((extent - 9) ** 2, extent))
+    points = set()
+    while len(points) < size:
+        points.add((rng.randint(10, extent), rng.randint(10, extent)))
+    return '\n'.join('%d, %d' % point for point in points) + '\n'
+
+
 def solution1(data):
     maxx, maxy, points = data['maxx'], data['maxy'], data['points']
 
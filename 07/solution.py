@@ -1,3 +1,5 @@
+import string
+
 from collections import defaultdict, deque
 from copy import deepcopy
 
@@ -19,6 +21,22 @@ def read_input(filename):
     return {'steps': steps, 'deps': deps}
 
 
+def generate_input(size, rng):
+    """`size` dependencies between the steps A..Z in a random but acyclic order
+
+    Steps are single letters, so there are at most 26 * 25 / 2 = 325 dependencies.
+    """
+    order = list(string.ascii_uppercase)
+    rng.shuffle(order)
+    pairs = [(first, second) for i, first in enumerate(order) for second in order[i + 1:]]
+    if size > len(pairs):
+        raise ValueError('at most %d dependencies between the steps A..Z, not %d' % (len(pairs), size))
+    return ''.join(
+        'Step %s must be finished before step %s can begin.\n' % pair
+        for pair in rng.sample(pairs, size)
+    )
+
+
 def solution1(data):
     data = deepcopy(data)
     steps, deps = data['steps'], data['deps']
@@ -21,6 +21,25 @@ def read_input(filename):
     return tree
 
 
+def generate_input(size, rng, max_metadata=5):
+    """license tree of `size` nodes, each node hangs under a random earlier node"""
+    children = [[] for _ in range(size)]
+    for node in range(1, size):
+        children[rng.randrange(node)].append(node)
+    encoding = []
+    stack = [(0, None)]
+    while stack:
+        node, metadata = stack.pop()
+        if metadata is not None:  # all children are written, close the node
+            encoding += metadata
+            continue
+        metadata = [rng.randint(1, len(children[node]) + 1) for _ in range(rng.randint(1, max_metadata))]
+        encoding += [len(children[node]), len(metadata)]
+        stack.append((node, metadata))
+        stack.extend((child, None) for child in reversed(children[node]))
+    return ' '.join(str(i) for i in encoding) + '\n'
+
+
 def _read_tree(encoding):
     n_children = encoding[0]
     n_metadata_entries = encoding[1]
@@ -1,7 +1,5 @@
 import re
 
-from blist import blist
-
 from collections import defaultdict
 from itertools import cycle
 
@@ -15,6 +13,11 @@ def read_input(filename):
         return {'nplayers': int(m[0]), 'nmarbles': int(m[1])}
 
 
+def generate_input(size, rng):
+    """game with `size` marbles and a random number of players"""
+    return '%d players; last marble is worth %d points\n' % (rng.randint(10, 500), size)
+
+
 def solution1(data):
     winners = _play_game(data['nplayers'], data['nmarbles'])
     return winners
@@ -26,6 +29,8 @@ def solution2(data):
 
 
 def _play_game(n_players, n_marbles, magic_number=23):
+    from blist import blist
+
     players = cycle(range(1, n_players + 1))
     scores = defaultdict(int)
     marbles = blist([0])
@@ -1,37 +1,35 @@
-import re
+import os
+import sys
 
-import matplotlib.pyplot as plt
-import numpy as np
+from aoc import columns
+from aoc.lazy import lazy_import
 
-from matplotlib.animation import FuncAnimation
+np = lazy_import('numpy')
 
-pat = re.compile('\-?\d+')
-
-x = y = vx = vy = None
-
-h = 10**10
-w = 10**10
-
-t = None
+REPLAY_SECONDS = 10  # the animation starts this many seconds before the message
 
 
 def read_input(filename):
-    stars = []
-    with open(filename) as f:
-        for line in f:
-            m = re.findall(pat, line)
-            x, y, vx, vy = int(m[0]), int(m[1]), int(m[2]), int(m[3])
-            stars.append((x, y, vx, vy))
-    return stars
-
-
-def solution1(stars):
-    global h, w
-    x = np.array([i[0] for i in stars])
-    y = np.array([i[1] for i in stars])
-    vx = np.array([i[2] for i in stars])
-    vy = np.array([i[3] for i in stars])
-
+    return columns.read_integers(filename, ('x', 'y', 'vx', 'vy'))
+
+
+def generate_input(size, rng, seconds=10000):
+    """`size` stars that line up into a random 10 row high pattern after `seconds` seconds"""
+    width = min(1000, max(10, size // 3))
+    lines = []
+    for _ in range(size):
+        x, y = rng.randrange(width), rng.randrange(10)
+        vx, vy = rng.choice((-1, 1)) * rng.randint(1, 5), rng.choice((-1, 1)) * rng.randint(1, 5)
+        lines.append(
+            'position=<%6d, %6d> velocity=<%2d, %2d>' % (x - vx * seconds, y - vy * seconds, vx, vy)
+        )
+    return '\n'.join(lines) + '\n'
+
+
+def shared_state(stars):
+    """Star positions at the second they spell the message, and that second: both parts need them"""
+    x, y, vx, vy = (np.array(stars[field]) for field in ('x', 'y', 'vx', 'vy'))
+    h = w = 10**10
     s = 0
     while h > 2000 or w > 2000:
         x += vx
@@ -39,36 +37,82 @@ def solution1(stars):
         h = max(x) - min(x)
         w = max(y) - min(y)
         s += 1
+    s += _settle(x, y, vx, vy)
+    return {'x': x, 'y': y, 'seconds': s}
 
+
+def solution1(stars, state=None):
+    if state is None:
+        state = shared_state(stars)
+    if _headless():
+        return '\n' + _render(state['x'], state['y'])
+
+    import matplotlib.pyplot as plt  # only needed (and only imported) when there is a display
+    from matplotlib.animation import FuncAnimation
+
+    vx, vy = np.array(stars['vx']), np.array(stars['vy'])
+    x, y = state['x'] - REPLAY_SECONDS * vx, state['y'] - REPLAY_SECONDS * vy
     fig, ax = plt.subplots()
-    scat = ax.scatter(x, y, s=h/12)
+    scat = ax.scatter(x, y, s=20)
+    view = {'h': 10**10, 'w': 10**10}
 
-    ani = FuncAnimation(fig, _update_plot, fargs=(x, y, vx, vy, ax, scat, s), interval=1)
+    ani = FuncAnimation(fig, _update_plot, fargs=(x, y, vx, vy, ax, scat, view), interval=1)
     plt.show()
     return ''
 
 
-def solution2(stars):
-    return t[1]
+def solution2(stars, state=None):
+    if state is None:
+        state = shared_state(stars)
+    return state['seconds']
+
+
+def _headless():
+    if os.environ.get('MPLBACKEND', '').lower() == 'agg':
+        return True
+    return sys.platform not in ('darwin', 'win32') and not (
+        os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')
+    )
+
+
+def _settle(x, y, vx, vy):
+    """Step until the bounding box stops shrinking, return the number of steps"""
+    i = 0
+    area = (max(x) - min(x)) * (max(y) - min(y))
+    while True:
+        x += vx
+        y += vy
+        new_area = (max(x) - min(x)) * (max(y) - min(y))
+        if new_area > area:
+            x -= vx
+            y -= vy
+            return i
+        area = new_area
+        i += 1
+
+
+def _render(x, y):
+    xmin, ymin = min(x), min(y)
+    rows = [['.'] * (max(x) - xmin + 1) for _ in range(max(y) - ymin + 1)]
+    for i, j in zip(x, y):
+        rows[j - ymin][i - xmin] = '#'
+    return '\n'.join(''.join(row) for row in rows)
 
 
-def _update_plot(i, x, y, vx, vy, ax, scat, s):
-    global h, w, t
+def _update_plot(i, x, y, vx, vy, ax, scat, view):
     x += vx
     y += vy
     xmax = max(x)
     xmin = min(x)
     ymax = max(y)
     ymin = min(y)
-    if h * w > (xmax - xmin) * (ymax - ymin):
-        h = ymax - ymin
+    if view['h'] * view['w'] > (xmax - xmin) * (ymax - ymin):
+        h = view['h'] = ymax - ymin
         mid = h / 2.0 + ymin
-        w = xmax - xmin
+        w = view['w'] = xmax - xmin
         if h < 1000 and w < 1000:
             scat.set_offsets([(i, 2 * mid - j) for i, j in zip(x, y)])
             ax.set_xlim(xmin-0.1*(xmax-xmin), xmax+0.1*(xmax-xmin))
             ax.set_ylim((ymin-0.1*(ymax-ymin)), (ymax+0.1*(ymax-ymin)))
             scat.set_sizes(np.full(x.shape, 20))
-        t = i, i + s + 2, h, w
-        print(t)  # need to +2 because i = 0 is called 2 times (for init and for first update)
     return scat,
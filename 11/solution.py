@@ -1,7 +1,11 @@
-import numpy as np
+from aoc.lazy import lazy_import
+
+np = lazy_import('numpy')
 
 SIZE = 300
 
+INDEPENDENT_PARTS = True
+
 
 def read_input(filename):
     with open(filename) as f:
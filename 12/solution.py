@@ -1,6 +1,9 @@
 import copy
+import itertools
 import re
 
+from aoc import cycles
+
 garden_pattern = '(\.|#)+'
 
 
@@ -16,6 +19,16 @@ def read_input(filename):
     return {'rules': rules, 'n_left': n_left, 'garden': garden, 'n_right': n_right}
 
 
+def generate_input(size, rng):
+    """`size` random pots with rules that move every plant one pot to the right each generation
+
+    Random rules mostly grow without ever repeating, these repeat from the first generation on.
+    """
+    pots = ''.join(rng.choice('.#') for _ in range(size))
+    rules = [''.join(pattern) for pattern in itertools.product('.#', repeat=5)]
+    return 'initial state: %s\n\n%s\n' % (pots, '\n'.join('%s => %s' % (rule, rule[1]) for rule in rules))
+
+
 def solution1(data):
     (
         rules,
@@ -37,21 +50,28 @@ def solution2(data):
 
 
 def _solve(n_left, garden, n_right, rules, generations):
-    prev_s = None
-    prev_diff = None
-    for i in range(generations):
-        s = _sum_pot_ids_with_plants(garden, n_left)
-        diff = s - prev_s if prev_s is not None else None
-        # print('generation=%d: %d, diff=%s' % (i, s, diff))
-        if diff is not None and prev_diff == diff:
-            print('Found repeating pattern at generation %d !' % i)
-            result = (generations - i) * diff + s  # speed-up result computation for remaining generations
-            return 'generations=(%d): %d' % (generations, result)
-        prev_s = s
-        prev_diff = diff
-        n_left, garden, n_right = _grow_garden(n_left, garden, n_right, rules)
-
-    return 'generations=(%d): %d' % (generations, _sum_pot_ids_with_plants(garden, n_left))
+    # the pattern of plants repeats while it shifts along the pots
+    (n_left, garden, n_right), moved, cycle = cycles.fast_forward(
+        (n_left, garden, n_right),
+        lambda state: _grow_garden(*state, rules),
+        generations,
+        key=_pattern,
+        offset=_first_plant
+    )
+    if cycle:
+        print('Found repeating pattern at generation %d (cycle of %d) !' % cycle)
+    result = _sum_pot_ids_with_plants(garden, n_left) + moved * garden.count('#')
+    return 'generations=(%d): %d' % (generations, result)
+
+
+def _pattern(state):
+    _, garden, _ = state
+    return ''.join(garden).strip('.')
+
+
+def _first_plant(state):
+    n_left, garden, _ = state
+    return garden.index('#') - n_left if '#' in garden else 0
 
 
 def _read_garden_state(line):
@@ -100,6 +120,22 @@ def _adjust_extremes(n_left, garden, n_right):
     return n_left, garden, n_right
 
 
+TEST_RULES = '''...## => #
+..#.. => #
+.#... => #
+.#.#. => #
+.#.## => #
+.##.. => #
+.#### => #
+#.#.# => #
+#.### => #
+##.#. => #
+##.## => #
+###.. => #
+###.# => #
+####. => #'''
+
+
 def test_read_input():
     l, g, r = _read_garden_state('##..##')
     assert (5, '.....##..##.....', 5) == (l, ''.join(g), r)
@@ -122,25 +158,27 @@ def test_solution1():
 
     # test from problem description
     garden = '...#..#.#..##......###...###...........'
-    line_rules = '''...## => #
-..#.. => #
-.#... => #
-.#.#. => #
-.#.## => #
-.##.. => #
-.#### => #
-#.#.# => #
-#.### => #
-##.#. => #
-##.## => #
-###.. => #
-###.# => #
-####. => #'''
     rules = {}
-    for line in line_rules.splitlines():
+    for line in TEST_RULES.splitlines():
         left, right = _to_rule(line)
         rules[left] = right
     garden = [c for c in garden]
     new_garden = _apply_rules(garden, rules)
     expected_garden = '...#...#....#.....#..#..#..#...........'
     assert expected_garden == ''.join(new_garden)
+
+
+def test_solution2():
+    n_left, garden, n_right = _read_garden_state('#..#.#..##......###...###')
+    rules = {}
+    for line in TEST_RULES.splitlines():
+        left, right = _to_rule(line)
+        rules[left] = right
+    # from generation 86 on the pattern repeats, shifted by one pot per generation
+    state = n_left, garden, n_right
+    for generations in range(1, 201):
+        state = _grow_garden(*state, rules)
+        if generations in (1, 2, 85, 86, 87, 128, 129, 200):
+            expected = 'generations=(%d): %d' % (generations, _sum_pot_ids_with_plants(state[1], state[0]))
+            assert expected == _solve(n_left, garden, n_right, rules, generations), generations
+    assert 'generations=(20): 325' == _solve(n_left, garden, n_right, rules, 20)
@@ -1,9 +1,19 @@
+import math
+
+from copy import deepcopy
+
+from aoc.grid import Grid
+
+LOOP_CELL = (8, 14)  # rows and columns of the generated input that hold one loop of track
+
 TOP = 1
 RIGHT = 2
 BOTTOM = 3
 LEFT = 4
 INTERSECTION = 5
 
+VERTICAL, HORIZONTAL, SLASH, BACKSLASH, CROSSING = b'|-/\\+'
+
 INITIAL_ORIENTATION_TO_DIRECTION = {
     '^': TOP,
     'v': BOTTOM,
@@ -12,10 +22,10 @@ INITIAL_ORIENTATION_TO_DIRECTION = {
 }
 
 DRIVING_RULES = {
-    TOP: {'|': TOP, '/': RIGHT, '\\': LEFT, '+': INTERSECTION},
-    RIGHT: {'/': TOP, '\\': BOTTOM, '-': RIGHT, '+': INTERSECTION},
-    BOTTOM: {'|': BOTTOM, '/': LEFT, '\\': RIGHT, '+': INTERSECTION},
-    LEFT: {'/': BOTTOM, '\\': TOP, '-': LEFT, '+': INTERSECTION},
+    TOP: {VERTICAL: TOP, SLASH: RIGHT, BACKSLASH: LEFT, CROSSING: INTERSECTION},
+    RIGHT: {SLASH: TOP, BACKSLASH: BOTTOM, HORIZONTAL: RIGHT, CROSSING: INTERSECTION},
+    BOTTOM: {VERTICAL: BOTTOM, SLASH: LEFT, BACKSLASH: RIGHT, CROSSING: INTERSECTION},
+    LEFT: {SLASH: BOTTOM, BACKSLASH: TOP, HORIZONTAL: LEFT, CROSSING: INTERSECTION},
 }
 
 INTERSECTION_CHOICES = {
@@ -42,7 +52,7 @@ class Cart:
             self.x -= 1
         elif self.direction == RIGHT:
             self.x += 1
-        road_direction = road[self.y][self.x]
+        road_direction = road[self.y, self.x]
         direction = DRIVING_RULES[self.direction][road_direction]
         if direction == INTERSECTION:
             self.direction = INTERSECTION_CHOICES[self.direction][self.intersection_choice]
@@ -58,35 +68,64 @@ class Cart:
 
 
 def read_input(filename):
-    road = []
     carts = []
     with open(filename) as f:
-        y = 0
-        for line in f.readlines():
-            row = [c for c in line]
-            for x, c in enumerate(row):
-                if c in ('v', '^', '>', '<'):
-                    carts.append(Cart(x, y, c))
-                    row[x] = '-' if c in ('>', '<') else '|'
-            road.append(row)
-            y += 1
+        lines = f.read().splitlines()
+    road = Grid.from_lines(lines)
+    for y, line in enumerate(lines):
+        for x, c in enumerate(line):
+            if c in ('v', '^', '>', '<'):
+                carts.append(Cart(x, y, c))
+                road[y, x] = HORIZONTAL if c in ('>', '<') else VERTICAL
     return {'road': road, 'carts': carts}
 
 
-def solution1(data):
-    road, carts = data['road'], data['carts']
-    first_car_crash_location = None
+def generate_input(size, rng):
+    """`size` separate loops of track with two carts heading for each other, and one more loop with the last cart
+
+    Random track and carts need not crash at all, here every pair crashes within half its loop.
+    """
+    columns = max(1, math.isqrt(size + 1))
+    rows = []
+    for loop in range(size + 1):
+        row, column = divmod(loop, columns)
+        if len(rows) <= row * LOOP_CELL[0]:
+            rows.extend([' '] * (LOOP_CELL[1] * columns) for _ in range(LOOP_CELL[0]))
+        top, left = row * LOOP_CELL[0], column * LOOP_CELL[1]
+        height, width = rng.randint(3, LOOP_CELL[0] - 1), rng.randint(4, LOOP_CELL[1] - 1)
+        bottom, right = top + height - 1, left + width - 1
+        for x in range(left + 1, right):
+            rows[top][x] = rows[bottom][x] = '-'
+        for y in range(top + 1, bottom):
+            rows[y][left] = rows[y][right] = '|'
+        rows[top][left] = rows[bottom][right] = '/'
+        rows[top][right] = rows[bottom][left] = '\\'
+        carts = rng.sample(range(left + 1, right), 1 if loop == size else 2)
+        rows[top][min(carts)] = '>'
+        if len(carts) == 2:
+            rows[top][max(carts)] = '<'
+    return ''.join(''.join(row).rstrip() + '\n' for row in rows)
+
+
+def shared_state(data):
+    """Drive copies of the carts up to the first crash: part 1 reports it, part 2 continues from there"""
+    road, carts = data['road'], deepcopy(data['carts'])
     crashed_carts = []
     while not crashed_carts:
         carts, crashed_carts = _move_carts(carts, road)
-        if crashed_carts:
-            first_car_crash_location = crashed_carts[0].x, crashed_carts[0].y
-    data['carts'] = carts  # keep updated position for solution2
-    return 'First crash at location %s' % (first_car_crash_location, )
+    return {'first_crash': (crashed_carts[0].x, crashed_carts[0].y), 'carts': carts}
+
+
+def solution1(data, state=None):
+    if state is None:
+        state = shared_state(data)
+    return 'First crash at location %s' % (state['first_crash'], )
 
 
-def solution2(data):
-    road, carts = data['road'], data['carts']
+def solution2(data, state=None):
+    if state is None:
+        state = shared_state(data)
+    road, carts = data['road'], deepcopy(state['carts'])
     while len(carts) > 1:
         carts, _ = _move_carts(carts, road)
     return 'Last cart is located at: (%d, %d)' % (carts[0].x, carts[0].y)
@@ -1,5 +1,8 @@
 from collections import deque
 
+from aoc import progress, stats
+from aoc.grid import Grid
+
 ATTACK_POWER = 3
 INIT_HIT_POINTS = 200
 
@@ -7,8 +10,9 @@ ELF = 'E'
 GOBLIN = 'G'
 OPEN_CAVERN = '.'
 WALL = '#'
+OPEN_CELL = ord(OPEN_CAVERN)
 
-AREA = None
+INDEPENDENT_PARTS = True
 
 
 class EarlyGameOver(Exception):
@@ -20,6 +24,7 @@ class Player:
         self.x = x
         self.y = y
         self.team = team
+        self.cell = ord(team)
         self.power = power
         self.hit_points = hit_points
         self._team_str = 'Elf' if team == 'E' else 'Goblin'
@@ -42,29 +47,24 @@ class Player:
     def alive(self):
         return self.hit_points > 0
 
-    def take_turn(self, players):
+    def take_turn(self, players, area):
         enemies = [p for p in players if p.team != self.team and p.alive()]
         if not enemies:
             raise EarlyGameOver('%s win before round ends!' % self._team_str)
-        if self.attack(enemies):
+        if self.attack(enemies, area):
             return
         else:
-            in_range_positions = self.range(enemies)
+            in_range_positions = self.range(enemies, area)
             if in_range_positions:
-                self.move(in_range_positions)
-                self.attack(enemies)
+                self.move(in_range_positions, area)
+                self.attack(enemies, area)
 
-    def attack(self, enemies):
+    def attack(self, enemies, area):
         # it is faster to check adjacent cells of self first
         # that to collect adjacent cells of enemies and compare to position of self
-        targets = [
-            (x, y) for x, y in (
-                (self.x - 1, self.y),
-                (self.x, self.y - 1),
-                (self.x, self.y + 1),
-                (self.x + 1, self.y)
-            ) if x >= 0 and y >= 0 and AREA[x][y] == enemies[0].team
-        ]
+        index = area.index(self.x, self.y)
+        enemy_cell = enemies[0].cell
+        targets = [area.position(index + o) for o in area.offsets4 if area.cells[index + o] == enemy_cell]
         if targets:
             targeted_enemies = [enemy for enemy in enemies if (enemy.x, enemy.y) in targets]
             selected_enemy = targeted_enemies[0]
@@ -73,55 +73,48 @@ class Player:
                     selected_enemy = te
             selected_enemy.hit_points -= self.power
             if selected_enemy.hit_points <= 0:
-                AREA[selected_enemy.x][selected_enemy.y] = OPEN_CAVERN
+                area[selected_enemy.x, selected_enemy.y] = OPEN_CELL
             return selected_enemy
 
-    def range(self, enemies):
+    def range(self, enemies, area):
         result = []
         for enemy in enemies:
-            result += [
-                (x, y) for x, y in (
-                    (enemy.x - 1, enemy.y),
-                    (enemy.x, enemy.y - 1),
-                    (enemy.x, enemy.y + 1),
-                    (enemy.x + 1, enemy.y)
-                ) if x >= 0 and y >= 0 and AREA[x][y] == OPEN_CAVERN
-            ]
+            index = area.index(enemy.x, enemy.y)
+            result += [area.position(index + o) for o in area.offsets4 if area.cells[index + o] == OPEN_CELL]
         # pre-optimize the search for shortest paths by searching first for path to closest units
         return sorted(result, key=lambda c: abs(self.x - c[0]) + abs(self.y - c[1]))
 
-    def move(self, candidate_positions):
+    def move(self, candidate_positions, area):
         next_move = None
         shortest_distance = float('inf')
         for x, y in candidate_positions:
-            next_location, distance = _find_shortest_path(self.x, self.y, x, y, shortest_distance)
+            next_location, distance = _find_shortest_path(area, self.x, self.y, x, y, shortest_distance)
             if next_location and (distance < shortest_distance or next_location < next_move):
                 next_move = next_location
                 shortest_distance = distance
         if next_move:
-            AREA[self.x][self.y] = OPEN_CAVERN
+            area[self.x, self.y] = OPEN_CELL
             self.x, self.y = next_move
-            AREA[self.x][self.y] = self.team
+            area[self.x, self.y] = self.cell
 
 
-def _find_shortest_path(ox, oy, tx, ty, max_distance):
-    queue = deque([(tx, ty, 0, None)])
+def _find_shortest_path(area, ox, oy, tx, ty, max_distance):
+    cells, offsets = area.cells, area.offsets4
+    origin = area.index(ox, oy)
+    queue = deque([(area.index(tx, ty), 0, None)])
     seen = set()
+    expand = stats.counted(seen.add, 'bfs nodes expanded')
     while queue:
-        px, py, distance, parent = queue.popleft()
-        if distance > max_distance or (px, py) in seen:
+        p, distance, parent = queue.popleft()
+        if distance > max_distance or p in seen:
             continue
-        seen.add((px, py))
-        if (px, py) == (ox, oy):
-            return parent, distance
-        for x, y in [
-            (px - 1, py),
-            (px, py - 1),
-            (px, py + 1),
-            (px + 1, py)
-        ]:
-            if x >= 0 and y >= 0 and (AREA[x][y] == OPEN_CAVERN or (x, y) == (ox, oy)):
-                queue.append((x, y, distance + 1, (px, py)))
+        expand(p)
+        if p == origin:
+            return (None if parent is None else area.position(parent)), distance
+        for o in offsets:
+            n = p + o
+            if cells[n] == OPEN_CELL or n == origin:
+                queue.append((n, distance + 1, p))
     return None, None
 
 
@@ -130,20 +123,33 @@ def read_input(filename):
         return f.read()
 
 
+def generate_input(size, rng, units=None):
+    """`size` x `size` cave with pillars and `units` (default size // 2) elves and goblins
+
+    Pillars only stand on cells with two even coordinates, so every open cell stays reachable.
+    """
+    units = units or max(2, size // 2)
+    rows = [[WALL] * size for _ in range(size)]
+    for x in range(1, size - 1):
+        for y in range(1, size - 1):
+            pillar = x % 2 == 0 and y % 2 == 0 and rng.random() < 0.5
+            rows[x][y] = WALL if pillar else OPEN_CAVERN
+    open_cells = [(x, y) for x, row in enumerate(rows) for y, c in enumerate(row) if c == OPEN_CAVERN]
+    for i, (x, y) in enumerate(rng.sample(open_cells, min(units, len(open_cells)))):
+        rows[x][y] = ELF if i % 2 else GOBLIN
+    return '\n'.join(''.join(row) for row in rows) + '\n'
+
+
 def _initialize_game(contents, elf_power):
-    global AREA
-    AREA = []
+    lines = [line.strip() for line in contents.splitlines()]
+    area = Grid.from_lines(lines, fill=WALL.encode(), border=WALL.encode())
     players = []
-    for row, line in enumerate(contents.splitlines()):
-        line = line.strip()
-        l = []
+    for row, line in enumerate(lines):
         for column, char in enumerate(line):
             if char in (GOBLIN, ELF):
                 p = Player(row, column, char, ATTACK_POWER if char == GOBLIN else elf_power, INIT_HIT_POINTS)
                 players.append(p)
-            l.append(char)
-        AREA.append(l)
-    return players
+    return area, players
 
 
 def solution1(contents):
@@ -156,6 +162,7 @@ def solution2(contents):
     winner_losses = None
     elf_power = ATTACK_POWER + 1
     while winning_team == GOBLIN or winner_losses:
+        progress.checkpoint(elf_power=elf_power)
         score, team, winner_losses = _play_game(contents, elf_power)
         print('%s wins with score %d (elf power = %d)' % (team, score, elf_power))
         winning_team = team
@@ -164,7 +171,7 @@ def solution2(contents):
 
 
 def _play_game(contents, elf_power):
-    players = _initialize_game(contents, elf_power)
+    area, players = _initialize_game(contents, elf_power)
     init_players = {GOBLIN: sum(1 for p in players if p.team == GOBLIN)}
     init_players[ELF] = len(players) - init_players[GOBLIN]
     rounds = 0
@@ -172,9 +179,10 @@ def _play_game(contents, elf_power):
         while not _game_over(players):
             for player in sorted(players):
                 if player.alive():
-                    player.take_turn(players)
+                    player.take_turn(players, area)
             players = sorted(p for p in players if p.alive())
             rounds += 1
+            progress.checkpoint(rounds=rounds)
     except EarlyGameOver as e:
         print(e)
     finally:
@@ -190,18 +198,16 @@ def _game_over(players):
 
 
 def test_read_input():
-    players = _initialize_game("""#######
+    area, players = _initialize_game("""#######
 #E..G.#
 #...#.#
 #.G.#G#
 #######""", ATTACK_POWER)
-    assert [
-               ['#', '#', '#', '#', '#', '#', '#'],
-               ['#', 'E', '.', '.', 'G', '.', '#'],
-               ['#', '.', '.', '.', '#', '.', '#'],
-               ['#', '.', 'G', '.', '#', 'G', '#'],
-               ['#', '#', '#', '#', '#', '#', '#', ]
-           ] == AREA
+    assert """#######
+#E..G.#
+#...#.#
+#.G.#G#
+#######""" == str(area)
 
     assert [
                Player(1, 1, ELF, ATTACK_POWER, INIT_HIT_POINTS),
@@ -3,85 +3,12 @@ import json
 
 from collections import namedtuple
 
+from aoc import elfcode
+
 Sample = namedtuple('Sample', ['before_state', 'instruction', 'after_state'])
 BinaryInstruction = namedtuple('BinaryInstruction', ['opcode', 'in1', 'in2', 'out'])
 
 
-def addr(r, bi):
-    r[bi.out] = r[bi.in1] + r[bi.in2]
-
-
-def addi(r, bi):
-    r[bi.out] = r[bi.in1] + bi.in2
-
-
-def mulr(r, bi):
-    r[bi.out] = r[bi.in1] * r[bi.in2]
-
-
-def muli(r, bi):
-    r[bi.out] = r[bi.in1] * bi.in2
-
-
-def banr(r, bi):
-    r[bi.out] = r[bi.in1] & r[bi.in2]
-
-
-def bani(r, bi):
-    r[bi.out] = r[bi.in1] & bi.in2
-
-
-def borr(r, bi):
-    r[bi.out] = r[bi.in1] | r[bi.in2]
-
-
-def bori(r, bi):
-    r[bi.out] = r[bi.in1] | bi.in2
-
-
-def setr(r, bi):
-    r[bi.out] = r[bi.in1]
-
-
-def seti(r, bi):
-    r[bi.out] = bi.in1
-
-
-def gtir(r, bi):
-    r[bi.out] = int(bi.in1 > r[bi.in2])
-
-
-def gtri(r, bi):
-    r[bi.out] = int(r[bi.in1] > bi.in2)
-
-
-def gtrr(r, bi):
-    r[bi.out] = int(r[bi.in1] > r[bi.in2])
-
-
-def eqir(r, bi):
-    r[bi.out] = int(bi.in1 == r[bi.in2])
-
-
-def eqri(r, bi):
-    r[bi.out] = int(r[bi.in1] == bi.in2)
-
-
-def eqrr(r, bi):
-    r[bi.out] = int(r[bi.in1] == r[bi.in2])
-
-
-INSTRUCTION_SPECS = [
-    addr, addi,
-    mulr, muli,
-    banr, bani,
-    borr, bori,
-    setr, seti,
-    gtir, gtri, gtrr,
-    eqir, eqri, eqrr
-]
-
-
 def read_input(filename):
     with open(filename) as f:
         contents = f.read()
@@ -92,30 +19,48 @@ def solution1(data):
     samples = data['samples']
     return sum(
         1 for sample in samples if len(
-            _get_matching_instructions(INSTRUCTION_SPECS, sample, stop_after=3)
+            _get_matching_instructions(elfcode.OPCODES, sample, stop_after=3)
         ) >= 3
     )
 
 
 def solution2(data):
     samples, test_program = data['samples'], data['test_program']
-    matches = _find_all_matches(samples)
-    identified_opcodes = {}
-    identified_instructions = set()
-    while len(identified_instructions) != len(INSTRUCTION_SPECS):
-        matches = {opcode: instructions for opcode, instructions in matches.items() if opcode not in identified_opcodes}
-        for opcode in sorted(matches, key=lambda opcode: len(matches[opcode])):
-            instructions = [i for i in matches[opcode] if i not in identified_instructions]
-            if len(instructions) == 1:
-                instruction = instructions[0]
-                identified_opcodes[opcode] = instruction
-                identified_instructions.add(instruction)
-
-    registries = [0 for _ in samples[0].before_state]
-    for binary_instruction in test_program:
-        instruction = identified_opcodes[binary_instruction.opcode]
-        instruction(registries, binary_instruction)
-    return registries[0]
+    identified_opcodes = _identify_opcodes(_find_all_matches(samples))
+    code = elfcode.encode((identified_opcodes[bi.opcode], bi.in1, bi.in2, bi.out) for bi in test_program)
+    machine = elfcode.Machine(elfcode.Program(None, code), registers=len(samples[0].before_state))
+    machine.run()
+    machine.report()
+    return machine.registers[0]
+
+
+def generate_input(size, rng):
+    """`size` samples of a random opcode numbering followed by a program of `size` instructions
+
+    More samples are added until they identify every opcode. The program leaves out mulr, which
+    squares a register and would grow the numbers beyond any size within a few hundred instructions.
+    """
+    numbering = list(elfcode.OPCODES)
+    rng.shuffle(numbering)
+    samples = []
+    while len(samples) < size or not _identified(samples):
+        number, a, b, c = rng.randrange(len(numbering)), rng.randrange(4), rng.randrange(4), rng.randrange(4)
+        before = [rng.randrange(4) for _ in range(4)]
+        after = list(before)
+        elfcode.execute(numbering[number], after, a, b, c)
+        samples.append(Sample(before, BinaryInstruction(number, a, b, c), after))
+    program = []
+    while len(program) < size:
+        number = rng.randrange(len(numbering))
+        if numbering[number] != 'mulr':
+            program.append('%d %d %d %d' % (number, rng.randrange(4), rng.randrange(4), rng.randrange(4)))
+    return '%s\n\n\n\n%s\n' % (
+        '\n\n'.join(
+            'Before: %s\n%s\nAfter:  %s' % (sample.before_state, ' '.join(map(str, sample.instruction)), sample.after_state)
+            for sample in samples
+        ),
+        '\n'.join(program)
+    )
 
 
 def _parse(contents):
@@ -141,9 +86,10 @@ def _parse_samples(samples):
 def _get_matching_instructions(instructions, sample, stop_after=float('inf')):
     result = set()
     c = 0
+    operands = sample.instruction[1:]
     for instruction in instructions:
         registers = copy.copy(sample.before_state)
-        instruction(registers, sample.instruction)
+        elfcode.instruction(instruction, *operands)(registers)
         if registers == sample.after_state:
             result.add(instruction)
             c += 1
@@ -156,7 +102,7 @@ def _find_all_matches(samples):
     matches = {}
     for sample in samples:
         opcode = sample.instruction.opcode
-        instructions = _get_matching_instructions(INSTRUCTION_SPECS, sample)
+        instructions = _get_matching_instructions(elfcode.OPCODES, sample)
         if opcode not in matches:
             matches[opcode] = set(instructions)
         else:
@@ -164,6 +110,32 @@ def _find_all_matches(samples):
     return matches
 
 
+def _identify_opcodes(matches):
+    """Opcode number -> instruction name, from the names that every sample of a number matched"""
+    identified_opcodes = {}
+    identified_instructions = set()
+    while len(identified_instructions) != len(elfcode.OPCODES):
+        matches = {opcode: instructions for opcode, instructions in matches.items() if opcode not in identified_opcodes}
+        identified = len(identified_opcodes)
+        for opcode in sorted(matches, key=lambda opcode: len(matches[opcode])):
+            instructions = [i for i in matches[opcode] if i not in identified_instructions]
+            if len(instructions) == 1:
+                instruction = instructions[0]
+                identified_opcodes[opcode] = instruction
+                identified_instructions.add(instruction)
+        if len(identified_opcodes) == identified:
+            raise ValueError('the samples leave opcodes %s ambiguous' % sorted(matches))
+    return identified_opcodes
+
+
+def _identified(samples):
+    try:
+        _identify_opcodes(_find_all_matches(samples))
+    except ValueError:
+        return False
+    return True
+
+
 def test_read_input():
     contents = """Before: [1, 1, 3, 3]
 11 1 0 1
@@ -209,15 +181,15 @@ def test_solution1():
         after_state=[3, 2, 2, 1]
     )
     regs = copy.copy(sample.before_state)
-    mulr(regs, sample.instruction)
+    elfcode.execute('mulr', regs, *sample.instruction[1:])
     assert [3, 2, 2, 1] == regs
 
     regs = copy.copy(sample.before_state)
-    addi(regs, sample.instruction)
+    elfcode.execute('addi', regs, *sample.instruction[1:])
     assert [3, 2, 2, 1] == regs
 
     regs = copy.copy(sample.before_state)
-    seti(regs, sample.instruction)
+    elfcode.execute('seti', regs, *sample.instruction[1:])
     assert [3, 2, 2, 1] == regs
 
-    assert 3 == len(_get_matching_instructions(INSTRUCTION_SPECS, sample, stop_after=3))
+    assert 3 == len(_get_matching_instructions(elfcode.OPCODES, sample, stop_after=3))
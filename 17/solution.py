@@ -1,12 +1,11 @@
 import sys
 
-CLAY = '#'
-SAND = '.'
-SOURCE = '+'
-WATER = '~'
-WET_SAND = '|'
+from aoc.grid import Grid
+
+CLAY, SAND, SOURCE, WATER, WET_SAND = b'#.+~|'
 
 TILE_SUPPORT = {CLAY, WATER}
+DUMP_FILE = None  # set to a filename to write the ground there once the water settled, for debugging
 
 
 def read_input(filename):
@@ -14,20 +13,46 @@ def read_input(filename):
     return _build_ground(contents)
 
 
-def solution1(data):
+def generate_input(size, rng):
+    """`size` clay pots, each one in its own 20 x 15 cell of a grid around the spring at x=500"""
+    columns = max(1, int(size ** 0.5))
+    lines = []
+    for i in range(size):
+        row, column = divmod(i, columns)
+        left = 500 + (column - columns // 2) * 20 + rng.randint(0, 4)
+        right = left + rng.randint(4, 14)
+        top = 5 + row * 15 + rng.randint(0, 3)
+        bottom = top + rng.randint(3, 10)
+        lines.append('x=%d, y=%d..%d' % (left, top, bottom))
+        lines.append('x=%d, y=%d..%d' % (right, top, bottom))
+        lines.append('y=%d, x=%d..%d' % (bottom, left, right))
+    return '\n'.join(lines) + '\n'
+
+
+def shared_state(data):
+    """A copy of the ground after the water settled, both parts count its tiles"""
     source = data['source']
-    grid = data['grid']  # modify in place to reuse the result in second solution
-    sys.setrecursionlimit(len(grid) + len(grid[0]))
+    grid = data['grid'].copy()
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), grid.height + grid.width))
     try:
         _pour_water(source[0] + 1, source[1], grid)
     finally:
-        with open('solution17.txt', 'w') as f:
-            f.write(_make_printable_grid(grid))
-    return sum(1 for row in grid for tile in row if tile in (WET_SAND, WATER))
+        if DUMP_FILE:
+            with open(DUMP_FILE, 'w') as f:
+                f.write(_make_printable_grid(grid))
+    return grid
+
+
+def solution1(data, state=None):
+    if state is None:
+        state = shared_state(data)
+    return state.count(WET_SAND) + state.count(WATER)
 
 
-def solution2(data):
-    return sum(1 for row in data['grid'] for tile in row if tile == WATER)
+def solution2(data, state=None):
+    if state is None:
+        state = shared_state(data)
+    return state.count(WATER)
 
 
 def _get_contents(filename):
@@ -47,11 +72,11 @@ def _build_ground(contents):
     y_min = min(clay_y)
     y_max = max(clay_y)
     n_columns = y_max - y_min + 1 + 2  # extra sand columns for water overflow
-    grid = [[SAND] * n_columns for _ in range(x_min - 1, x_max + 1)]  # extra row for source
+    grid = Grid(x_max - x_min + 2, n_columns, bytes((SAND, )))  # extra row for source
     source_y = 500 - y_min + 1
-    grid[0][source_y] = SOURCE
+    grid[0, source_y] = SOURCE
     for x, y in zip(clay_x, clay_y):
-        grid[x - x_min + 1][y - y_min + 1] = CLAY
+        grid[x - x_min + 1, y - y_min + 1] = CLAY
     return {'grid': grid, 'source': (0, source_y)}
 
 
@@ -71,41 +96,40 @@ def _get_points(line):
 
 
 def _pour_water(x, y, grid):
-    if x == len(grid):
+    if x == grid.height:
         return
-    tile = grid[x][y]
+    tile = grid[x, y]
     if tile in TILE_SUPPORT:
         return
     if tile == SAND:
-        grid[x][y] = WET_SAND
+        grid[x, y] = WET_SAND
         _pour_water(x + 1, y, grid)
-        if x == len(grid) - 1 or grid[x + 1][y] not in TILE_SUPPORT:
+        if x == grid.height - 1 or grid[x + 1, y] not in TILE_SUPPORT:
             return
         # spread left
         ly = y - 1
         l_hit = False
-        while grid[x + 1][ly] in TILE_SUPPORT:
-            if grid[x][ly] == CLAY:
+        while grid[x + 1, ly] in TILE_SUPPORT:
+            if grid[x, ly] == CLAY:
                 l_hit = True
                 break
             else:
-                assert grid[x][ly] not in TILE_SUPPORT
-                grid[x][ly] = WET_SAND
+                assert grid[x, ly] not in TILE_SUPPORT
+                grid[x, ly] = WET_SAND
                 ly -= 1
         # spread right
         ry = y + 1
         r_hit = False
-        while grid[x + 1][ry] in TILE_SUPPORT:
-            if grid[x][ry] == CLAY:
+        while grid[x + 1, ry] in TILE_SUPPORT:
+            if grid[x, ry] == CLAY:
                 r_hit = True
                 break
             else:
-                assert grid[x][ry] not in TILE_SUPPORT
-                grid[x][ry] = WET_SAND
+                assert grid[x, ry] not in TILE_SUPPORT
+                grid[x, ry] = WET_SAND
                 ry += 1
         if l_hit and r_hit:  # inside a clay pot
-            for yy in range(ly + 1, ry):
-                grid[x][yy] = WATER
+            grid.fill(WATER, x, ly + 1, ry)
         if not l_hit:
             _pour_water(x, ly, grid)
         if not r_hit:
@@ -172,11 +196,12 @@ x=504, y=10..13
 y=13, x=498..504"""
 
     data = _build_ground(initial_configuration)
-    result = solution1(data)
+    grid = shared_state(data)
+    result = solution1(data, grid)
     assert 57 == result, result
-    actual_result = _make_printable_grid(data['grid'])
+    actual_result = _make_printable_grid(grid)
     assert expected_result == actual_result, '\n' + actual_result
 
 
 def _make_printable_grid(grid):
-    return '\n'.join(''.join(row) for row in grid)
+    return str(grid)
@@ -1,100 +1,85 @@
-import copy
+import math
 
-from collections import defaultdict
+from aoc import cycles
+from aoc.grid import Grid
+from aoc.lazy import lazy_import
 
+np = lazy_import('numpy')
 
-OPEN = '.'
-TREE = '|'
-LUMBER = '#'
+
+OPEN, TREE, LUMBER = b'.|#'
 
 
 def read_input(filename):
     with open(filename) as f:
-        return [
-            [c for c in line]
-            for line in f.read().splitlines()
-        ]
+        return Grid.from_lines(f.read().splitlines(), border=b' ')
+
+
+def generate_input(size, rng):
+    """About `size` acres in a square, as open, wooded and lumberyard as the puzzle's own area"""
+    side = max(1, math.isqrt(size))
+    return ''.join(''.join(rng.choices('.|#', weights=(3, 1, 1), k=side)) + '\n' for _ in range(side))
 
 
 def solution1(area):
     n = 10
-    area = copy.deepcopy(area)
+    area = area.copy()
     for minute in range(1, n+1):
         _transform(area)
     return _compute(area)
 
 
 def solution2(area):
-    n = 1000000000
-    area = copy.deepcopy(area)
-    cache = defaultdict(list)
-    REPEAT_FACTOR = 10
-    last_n = []
-    for minute in range(1, n+1):
-        _transform(area)
-        number = _compute(area)
-        print('Minute: %d, %d, %s' % (minute, number, cache[number]))
-        if cache[number]:
-            last_n.append(number)
-        else:
-            last_n.clear()
-        if len(last_n) == REPEAT_FACTOR:
-            first_number_in_stable_sequence = last_n[0]
-            minutes = cache[first_number_in_stable_sequence]
-            print('Found first repeating iteration at minute %d' % minutes[0])
-            cycle_size = minutes[1] - minutes[0]
-            print('Cycle size %d' % cycle_size)
-            result_minute = (n - minutes[0]) % cycle_size + minutes[0]
-            print('Expected result to be found at minute: %d' % result_minute)
-            for number, minutes in cache.items():
-                if minutes[0] == result_minute:
-                    return number
-        else:
-            cache[number].append(minute)
-    return _compute(area)
+    return _compute(_after(area, 1000000000))
+
+
+def _after(area, minutes):
+    area, _, cycle = cycles.fast_forward(area, _next_minute, minutes, key=lambda area: bytes(area.cells))
+    if cycle:
+        print('Found first repeating minute %d, cycle size %d' % cycle)
+    return area
+
+
+def _next_minute(area):
+    area = area.copy()
+    _transform(area)
+    return area
 
 
 def _transform(area):
-    orig = copy.deepcopy(area)
-    for x, line in enumerate(area):
-        for y, c in enumerate(line):
-            n_open, n_tree, n_lumber = _count(x, y, orig)
-            if c == OPEN and n_tree >= 3:
-                area[x][y] = TREE
-            elif c == TREE and n_lumber >= 3:
-                area[x][y] = LUMBER
-            elif c == LUMBER and not (n_lumber and n_tree):
-                area[x][y] = OPEN
-
-
-def _count(x, y, orig):
-    n_open = n_tree = n_lumber = 0
-    for i in range(max(0, x - 1), min(x + 2, len(orig))):
-        for j in range(max(0, y - 1), min(y + 2, len(orig[x]))):
-            if i != x or j != y:
-                n_open += int(orig[i][j] == OPEN)
-                n_tree += int(orig[i][j] == TREE)
-                n_lumber += int(orig[i][j] == LUMBER)
-    return n_open, n_tree, n_lumber
+    # a writable view of the grid, the border keeps the shifted slices inside it
+    grid = np.frombuffer(area.cells, dtype=np.uint8).reshape(-1, area.stride)
+    inner = grid[1:-1, 1:-1]
+    trees = _neighbours(grid == TREE)
+    lumber = _neighbours(grid == LUMBER)
+    new = inner.copy()
+    new[(inner == OPEN) & (trees >= 3)] = TREE
+    new[(inner == TREE) & (lumber >= 3)] = LUMBER
+    new[(inner == LUMBER) & ((lumber == 0) | (trees == 0))] = OPEN
+    inner[:] = new
+
+
+def _neighbours(mask):
+    mask = mask.astype(np.uint8)
+    h, w = mask.shape
+    return sum(
+        mask[1 + dx:h - 1 + dx, 1 + dy:w - 1 + dy]
+        for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+    )
+
+
+def _count(x, y, area):
+    i = area.index(x, y)
+    neighbours = [area.cells[i + o] for o in area.offsets8]
+    return neighbours.count(OPEN), neighbours.count(TREE), neighbours.count(LUMBER)
 
 
 def _compute(area):
-    tree = 0
-    lumber = 0
-    for line in area:
-        for c in line:
-            tree += int(c == TREE)
-            lumber += int(c == LUMBER)
-    result = tree * lumber
-    return result
+    return area.count(TREE) * area.count(LUMBER)
 
 
 def test_solution1():
-    area = [
-        ['.', '#', '|'],
-        ['#', '|', '.'],
-        ['|', '.', '#'],
-    ]
+    area = Grid.from_lines(['.#|', '#|.', '|.#'], border=b' ')
 
     assert (0, 1, 2) == _count(0, 0, area)
     assert (2, 2, 1) == _count(0, 1, area)
@@ -105,3 +90,26 @@ def test_solution1():
     assert (1, 1, 1) == _count(2, 0, area)
     assert (1, 2, 2) == _count(2, 1, area)
     assert (2, 1, 0) == _count(2, 2, area)
+
+
+SAMPLE = """.#.#...|#.
+.....#|##|
+.|..|...#.
+..|#.....#
+#.#|||#|#|
+...#.||...
+.|....|...
+||...#|.#|
+|.||||..|.
+...#.|..|."""
+
+
+def test_solution2():
+    area = Grid.from_lines(SAMPLE.splitlines(), border=b' ')
+    assert 1147 == solution1(area)
+    # the sample ends up empty, a cycle of length 1
+    simulated = area.copy()
+    for minutes in range(1, 41):
+        _transform(simulated)
+        assert simulated == _after(area, minutes), minutes
+    assert 0 == solution2(area)
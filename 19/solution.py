@@ -1,43 +1,75 @@
-from collections import namedtuple
+from aoc import elfcode
+
+# the puzzle's program with the constants that make up the number it sums the divisors of left open:
+# that number is 76 * the first + 22 * the second + the third
+PROGRAM = """#ip 1
+addi 1 16 1
+seti 1 4 4
+seti 1 1 2
+mulr 4 2 5
+eqrr 5 3 5
+addr 5 1 1
+addi 1 1 1
+addr 4 0 0
+addi 2 1 2
+gtrr 2 3 5
+addr 1 5 1
+seti 2 4 1
+addi 4 1 4
+gtrr 4 3 5
+addr 5 1 1
+seti 1 1 1
+mulr 1 1 1
+addi 3 2 3
+mulr 3 3 3
+mulr 1 3 3
+muli 3 %d 3
+addi 5 %d 5
+mulr 5 1 5
+addi 5 %d 5
+addr 3 5 3
+addr 1 0 1
+seti 0 7 1
+setr 1 3 5
+mulr 5 1 5
+addr 1 5 5
+mulr 1 5 5
+muli 5 14 5
+mulr 5 1 5
+addr 3 5 3
+seti 0 7 0
+seti 0 6 1
+"""
 
-Instruction = namedtuple('Instruction', ['name', 'in1', 'in2', 'out'])
 
+def read_input(filename):
+    with open(filename) as f:
+        return elfcode.parse(f.read())
 
-class Program:
-    def __init__(self, ip, instructions, n=6):
-        self.regs = [0] * n
-        self.ip = ip
-        self.instructions = instructions
-        self.size = len(instructions)
-
-    def init(self, reg0=0):
-        self.regs = [0] * len(self.regs)
-        self.regs[0] = reg0
-
-    def run(self):
-        while self.regs[self.ip] < self.size:
-            instruction = self.instructions[self.regs[self.ip]]
-            instruction.name(self.regs, instruction)
-            self.regs[self.ip] += 1
 
+def generate_input(size, rng):
+    """The puzzle's program summing the divisors of `size` in part 1, which takes about size ** 2 instructions
 
-def read_input(filename):
-    with open(filename) as f:
-        ip, instructions = _parse_instructions(f.read())
-        return Program(ip, instructions)
+    Part 2 runs the translated program for the number of the puzzle's input, whatever the input.
+    """
+    times_76, rest = divmod(size, 76)
+    return PROGRAM % ((times_76, ) + divmod(rest, 22))
 
 
 def solution1(program):
-    program.run()
-    return program.regs[0]
+    machine = elfcode.Machine(program)
+    machine.run()
+    machine.report()
+    return machine.registers[0]
 
 
 def solution2(program):
     """Naive solution is too slow
     # --------------------------
-    # program.init(reg0=1)
-    # program.run()
-    # return program.regs[0]
+    # machine = elfcode.Machine(program)
+    # machine.reset(reg0=1)
+    # machine.run()
+    # return machine.registers[0]
     # --------------------------
     Had to disassemble the program to understand what it does
 
@@ -97,82 +129,6 @@ def solution2(program):
     return sum(i for i in range(1, D + 1) if D % i == 0)
 
 
-def _parse_instructions(contents):
-    lines = contents.splitlines()
-    ipline, instruction_lines = lines[0], lines[1:]
-    ip = int(ipline[3:])
-    instructions = []
-    for line in instruction_lines:
-        name, in1, in2, out = line.split()
-        in1, in2, out = int(in1), int(in2), int(out)
-        instructions.append(Instruction(globals()[name], in1, in2, out))
-    return ip, instructions
-
-
-def addr(r, bi):
-    r[bi.out] = r[bi.in1] + r[bi.in2]
-
-
-def addi(r, bi):
-    r[bi.out] = r[bi.in1] + bi.in2
-
-
-def mulr(r, bi):
-    r[bi.out] = r[bi.in1] * r[bi.in2]
-
-
-def muli(r, bi):
-    r[bi.out] = r[bi.in1] * bi.in2
-
-
-def banr(r, bi):
-    r[bi.out] = r[bi.in1] & r[bi.in2]
-
-
-def bani(r, bi):
-    r[bi.out] = r[bi.in1] & bi.in2
-
-
-def borr(r, bi):
-    r[bi.out] = r[bi.in1] | r[bi.in2]
-
-
-def bori(r, bi):
-    r[bi.out] = r[bi.in1] | bi.in2
-
-
-def setr(r, bi):
-    r[bi.out] = r[bi.in1]
-
-
-def seti(r, bi):
-    r[bi.out] = bi.in1
-
-
-def gtir(r, bi):
-    r[bi.out] = int(bi.in1 > r[bi.in2])
-
-
-def gtri(r, bi):
-    r[bi.out] = int(r[bi.in1] > bi.in2)
-
-
-def gtrr(r, bi):
-    r[bi.out] = int(r[bi.in1] > r[bi.in2])
-
-
-def eqir(r, bi):
-    r[bi.out] = int(bi.in1 == r[bi.in2])
-
-
-def eqri(r, bi):
-    r[bi.out] = int(r[bi.in1] == bi.in2)
-
-
-def eqrr(r, bi):
-    r[bi.out] = int(r[bi.in1] == r[bi.in2])
-
-
 def test_solution1():
     text = """#ip 0
 seti 5 0 1
@@ -183,7 +139,6 @@ setr 1 0 0
 seti 8 0 4
 seti 9 0 5"""
 
-    ip, instructions = _parse_instructions(text)
-    program = Program(ip, instructions)
-    program.run()
-    assert [7, 5, 6, 0, 0, 9] == program.regs, program.regs
+    machine = elfcode.Machine(elfcode.parse(text))
+    machine.run()
+    assert [7, 5, 6, 0, 0, 9] == machine.registers, machine.registers
@@ -2,6 +2,8 @@ from collections import defaultdict, deque
 from copy import deepcopy
 from enum import IntFlag
 
+from aoc import stats
+
 
 class DFlag(IntFlag):
     UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
@@ -24,12 +26,18 @@ def read_input(filename):
         return labirinth
 
 
+def generate_input(size, rng, max_depth=3):
+    """route regex of about `size` characters with nested branches and detours"""
+    return '^%s$\n' % _random_route(size, rng, max_depth)
+
+
 def solution1(labirinth):
     rooms = deque()
     rooms.append((0, 0, 0))
     seen = {(0, 0)}
+    expand = stats.counted(rooms.popleft, 'bfs rooms expanded')
     while rooms:
-        x, y, distance = rooms.popleft()
+        x, y, distance = expand()
         for direction in DFlag:
             doors = labirinth[x, y]
             dx, dy = DELTA_DIRECTION[direction]
@@ -46,8 +54,9 @@ def solution2(labirinth):
     rooms = deque()
     rooms.append((0, 0, 0))
     seen = {(0, 0)}
+    expand = stats.counted(rooms.popleft, 'bfs rooms expanded')
     while rooms:
-        x, y, distance = rooms.popleft()
+        x, y, distance = expand()
         if distance >= MIN_DISTANCE:
             n += 1
         for direction in DFlag:
@@ -119,6 +128,37 @@ def _extract_paths(regex):
     return parts
 
 
+def _random_route(budget, rng, depth):
+    # like in the real inputs a branch that doesn't come back (A|B) ends its route,
+    # only detours (A|) are followed by more doors, otherwise the room sets multiply
+    parts = []
+    n = 0
+    while n < budget:
+        left = budget - n
+        if depth and left > 10 and rng.random() < 0.1:
+            if rng.random() < 0.5:
+                detour = '(%s|)' % _random_detour(rng.randint(2, min(left, 40)) // 2, rng)
+                parts.append(detour)
+                n += len(detour)
+                continue
+            parts.append(
+                '(%s|%s)' % (
+                    _random_route((left - 3) // 2, rng, depth - 1),
+                    _random_route((left - 3) // 2, rng, depth - 1)
+                )
+            )
+            break
+        parts.append(rng.choice('NESW'))
+        n += 1
+    return ''.join(parts)
+
+
+def _random_detour(length, rng):
+    # a detour ends where it started, like NEWS or NNESWS
+    half = [rng.choice('NESW') for _ in range(max(1, length // 2))]
+    return ''.join(half) + ''.join(OPPOSITE[c] for c in reversed(half))
+
+
 def test_read_input():
     result = _extract_paths('SEWN')
     assert ['SEWN'] == result, result
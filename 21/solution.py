@@ -1,5 +1,53 @@
+from aoc import elfcode
+
+# the puzzle's program with two constants left open: the bits set in the number it divides by 256 by counting
+# up to the quotient (65536 in the puzzle) and the seed of its hash (8595037)
+PROGRAM = """#ip 4
+seti 123 0 1
+bani 1 456 1
+eqri 1 72 1
+addr 1 4 4
+seti 0 0 4
+seti 0 7 1
+bori 1 %d 5
+seti %d 6 1
+bani 5 255 3
+addr 1 3 1
+bani 1 16777215 1
+muli 1 65899 1
+bani 1 16777215 1
+gtir 256 5 3
+addr 3 4 4
+addi 4 1 4
+seti 27 4 4
+seti 0 2 3
+addi 3 1 2
+muli 2 256 2
+gtrr 2 5 2
+addr 2 4 4
+addi 4 1 4
+seti 25 4 4
+addi 3 1 3
+seti 17 8 4
+setr 3 8 5
+seti 7 5 4
+eqrr 1 0 3
+addr 3 4 4
+seti 5 9 4
+"""
+
+
 def read_input(filename):
-    pass
+    with open(filename) as f:
+        return elfcode.parse(f.read())
+
+
+def generate_input(size, rng):
+    """The puzzle's program with a random seed, dividing 256 * `size` in about size steps in part 1
+
+    Part 2 runs the translated program of the puzzle's input, whatever the input.
+    """
+    return PROGRAM % (256 * size, rng.randrange(1 << 24))
 
 
 def _run(stop_on_first=False):
@@ -39,9 +87,25 @@ def _run(stop_on_first=False):
     return B
 
 
-def solution1(_):
-    return _run(stop_on_first=True)
+def solution1(program):
+    # the program halts the first time it compares register 0 with the smallest possible value
+    pointer, register = _halting_check(program)
+    machine = elfcode.Machine(program)
+    machine.run(breakpoint=pointer)
+    machine.report()
+    return machine.registers[register]
 
 
 def solution2(_):
+    # the last new value before they repeat takes billions of instructions, so this runs
+    # the hand translated program (see program_translation_steps.txt) instead of the VM
     return _run()
+
+
+def _halting_check(program):
+    """Pointer and compared register of the only instruction that reads register 0: eqrr X 0 Y"""
+    code = program.code
+    for i in range(0, len(code), 4):
+        if elfcode.OPCODES[code[i]] == 'eqrr' and 0 in (code[i + 1], code[i + 2]):
+            return i // 4, code[i + 2] if code[i + 1] == 0 else code[i + 1]
+    raise ValueError('The program never compares register 0')
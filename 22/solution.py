@@ -4,6 +4,8 @@ import sys
 
 from functools import lru_cache
 
+from aoc import stats
+
 sys.setrecursionlimit(sys.getrecursionlimit() * 3)
 
 C_EL = 20183
@@ -32,6 +34,8 @@ FORBIDDEN_TOOLS = {
     REGION_NARROW: TOOL_CLIMBING_GEAR
 }
 
+INDEPENDENT_PARTS = True
+
 
 def read_input(filename):
     with open(filename) as f:
@@ -40,6 +44,11 @@ def read_input(filename):
     return {'depth': depth, 'tx': tx, 'ty': ty}
 
 
+def generate_input(size, rng):
+    """cave with the target `size` deep and size // 10 wide, like the real inputs"""
+    return 'depth: %d\ntarget: %d,%d\n' % (rng.randint(3000, 12000), size // 10 + 1, size)
+
+
 def solution1(data):
     depth, tx, ty = data['depth'], data['tx'], data['ty']
     risk_level = 0
@@ -60,9 +69,11 @@ def solution2(data):
     # for traversed points and tools keep path len
     # Discard points with longer length that reach this point
     seen = {}
-    h.heappush(pqueue, (0, 0, 0, TOOL_TORCH))
+    push = stats.counted(h.heappush, 'heap pushes')
+    pop = stats.counted(h.heappop, 'heap pops')
+    push(pqueue, (0, 0, 0, TOOL_TORCH))
     while pqueue:
-        path_time, x, y, tool = h.heappop(pqueue)
+        path_time, x, y, tool = pop(pqueue)
         if x == tx and y == ty:
             if tool != TOOL_TORCH:
                 path_time += TIME_TOOL_CHANGE
@@ -84,14 +95,14 @@ def solution2(data):
                 forbidden_tool = FORBIDDEN_TOOLS[d_zone_type]
                 currently_forbidden_tool = FORBIDDEN_TOOLS[_erosion_level(x, y, tx, ty, depth) % 3]
                 if tool != forbidden_tool:
-                    h.heappush(pqueue, (path_time + TIME_ADVANCE, dx, dy, tool))
+                    push(pqueue, (path_time + TIME_ADVANCE, dx, dy, tool))
                 else:
                     for atool in OTHER_TOOLS[forbidden_tool]:
                         if atool == currently_forbidden_tool:
                             continue
                         dl = path_time + TIME_ADVANCE + TIME_TOOL_CHANGE
                         if (dx, dy, atool) not in seen or dl <= seen[dx, dy, atool]:
-                            h.heappush(pqueue, (dl, dx, dy, atool))
+                            push(pqueue, (dl, dx, dy, atool))
     return min_path_time
 
 
@@ -173,6 +184,6 @@ def test_solution1():
     assert 1805 == _erosion_level(1, 1, 10, 10, 510)
 
 
-def test2():
+def test_solution2():
     ans = solution2({'depth': 510, 'tx': 10, 'ty': 10})
     assert 45 == ans, 'Incorrect answer: %d' % ans
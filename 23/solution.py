@@ -1,14 +1,15 @@
 import math
-import re
 
 from copy import deepcopy
 
 from collections import namedtuple, deque
 
-LINE_PATT = re.compile('pos=<(?P<x>-?\d+),(?P<y>-?\d+),(?P<z>-?\d+)>, r=(?P<r>\d+)')
+from aoc import columns, stats
 
 Bot = namedtuple('Bot', ('x', 'y', 'z', 'r'))
 
+INDEPENDENT_PARTS = True
+
 
 def read_input(filename):
     with open(filename) as f:
@@ -17,28 +18,29 @@ def read_input(filename):
 
 
 def _parse_contents(contents):
-        result = []
-        for line in contents.splitlines():
-            m = re.match(LINE_PATT, line)
-            result.append(
-                Bot(
-                    int(m.group('x')),
-                    int(m.group('y')),
-                    int(m.group('z')),
-                    int(m.group('r'))
-                )
-            )
-        return result
+    return columns.integers(contents, Bot._fields)
+
+
+def generate_input(size, rng, extent=10**8):
+    """`size` nanobots spread over a cube of side 2 * `extent` with large radii"""
+    return ''.join(
+        'pos=<%d,%d,%d>, r=%d\n' % (
+            rng.randint(-extent, extent),
+            rng.randint(-extent, extent),
+            rng.randint(-extent, extent),
+            rng.randint(extent // 2, extent)
+        ) for _ in range(size)
+    )
 
 
 def solution1(nanobots):
-    largest_radius_nanobot = max(nanobots, key=lambda bot: bot.r)
-    largest_radius = largest_radius_nanobot.r
-    return sum(
-        1
-        for bot in nanobots
-        if _manhattan_distance(bot, largest_radius_nanobot) <= largest_radius
+    largest_radius_nanobot = nanobots[nanobots.r.argmax()]
+    distances = (
+        abs(nanobots.x - largest_radius_nanobot.x) +
+        abs(nanobots.y - largest_radius_nanobot.y) +
+        abs(nanobots.z - largest_radius_nanobot.z)
     )
+    return int((distances <= largest_radius_nanobot.r).sum())
 
 
 def solution2(nanobots):
@@ -48,6 +50,7 @@ def solution2(nanobots):
     original coordinates. Instead we refine the search area by changing the
     granularity of the search space. The zoom factors are powers of 2.
     """
+    nanobots = [Bot(*bot) for bot in nanobots.tolist()]
 
     bounds = _get_search_bounds(nanobots)
     print('Search for point in bounds: %s' % bounds)
@@ -56,10 +59,6 @@ def solution2(nanobots):
     return sum(abs(c) for c in most_common_coordinate)
 
 
-def _manhattan_distance(bot1, bot2):
-    return abs(bot1.x - bot2.x) + abs(bot1.y - bot2.y) + abs(bot1.z - bot2.z)
-
-
 def _get_search_bounds(nanobots):
     bounds = _radius_bounds(nanobots[0])
     for bot in nanobots[1:]:
@@ -118,6 +117,7 @@ def _find_coordinate(bounds, bots):
     n_bots = len(bots)
     results = []
     seen = set()
+    enqueue = stats.sized(queue.append, queue, 'queue appends', 'queue peak size')
     while queue:
         point = queue.popleft()
         if point[0] > bounds[0][1] or point[1] > bounds[1][1] or point[2] > bounds[2][1]:
@@ -131,20 +131,20 @@ def _find_coordinate(bounds, bots):
             if _in_range(point, b):
                 n_intersect += 1
         if n_intersect == n_bots:
-            return [point]
+            return point
         elif max_intersect is None or n_intersect >= max_intersect:
             if n_intersect == max_intersect:
                 results.append(point)
             else:
                 max_intersect = n_intersect
                 results = [point]
-        queue.append((point[0] + 1, point[1], point[2]))
-        queue.append((point[0], point[1] + 1, point[2]))
-        queue.append((point[0], point[1], point[2] + 1))
-        queue.append((point[0] + 1, point[1] + 1, point[2]))
-        queue.append((point[0] + 1, point[1], point[2] + 1))
-        queue.append((point[0], point[1] + 1, point[2] + 1))
-        queue.append((point[0] + 1, point[1] + 1, point[2] + 1))
+        enqueue((point[0] + 1, point[1], point[2]))
+        enqueue((point[0], point[1] + 1, point[2]))
+        enqueue((point[0], point[1], point[2] + 1))
+        enqueue((point[0] + 1, point[1] + 1, point[2]))
+        enqueue((point[0] + 1, point[1], point[2] + 1))
+        enqueue((point[0], point[1] + 1, point[2] + 1))
+        enqueue((point[0] + 1, point[1] + 1, point[2] + 1))
     return results[0]
 
 
@@ -152,7 +152,7 @@ def _in_range(point, bot):
     return sum(abs(p - b) for p, b in zip(point, bot)) <= bot.r
 
 
-def test():
+def test_solution1():
     input = """pos=<0,0,0>, r=4
 pos=<1,0,0>, r=1
 pos=<4,0,0>, r=3
@@ -167,20 +167,17 @@ pos=<1,3,1>, r=1"""
     assert 7 == result, result
 
 
-def test2():
+def test_solution2():
     _test__get_search_bounds()
     _test_find_starting_scale_factor()
 
-    result = solution2(
-        [
-            Bot(10, 12, 12, 2),
-            Bot(12, 14, 12, 2),
-            Bot(16, 12, 12, 4),
-            Bot(14, 14, 14, 6),
-            Bot(50, 50, 50, 200),
-            Bot(10, 10, 10, 5),
-        ]
-    )
+    input = """pos=<10,12,12>, r=2
+pos=<12,14,12>, r=2
+pos=<16,12,12>, r=4
+pos=<14,14,14>, r=6
+pos=<50,50,50>, r=200
+pos=<10,10,10>, r=5"""
+    result = solution2(_parse_contents(input))
     assert 36 == result, result  # point 12,12,12
 
 
@@ -3,6 +3,8 @@ import re
 from collections import namedtuple
 from copy import deepcopy
 
+from aoc import progress, stats
+
 
 PROPS_WEAKNESS = 'weak to (?P<weakness>\w+(, \w+)*)(; )?'
 PROPS_IMMUNITY = 'immune to (?P<immunity>\w+(, \w+)*)(; )?'
@@ -13,6 +15,9 @@ UNIT_LINE = re.compile(
     'with an attack that does (?P<attack_power>\d+) (?P<attack_type>\w+) damage ' + \
     'at initiative (?P<initiative>\d+)'
 )
+ARMY_LINE = re.compile('^(Immune System|Infection):[ \t]*$', re.MULTILINE)
+
+INDEPENDENT_PARTS = True
 
 
 class Army:
@@ -118,16 +123,45 @@ def read_input(filename):
         return _parse_content(content)
 
 
+def generate_input(size, rng):
+    """two armies of `size` groups each, with random weaknesses and immunities"""
+    attack_types = ('bludgeoning', 'cold', 'fire', 'radiation', 'slashing')
+    initiatives = rng.sample(range(1, 2 * size + 1), 2 * size)
+    lines = []
+    for army in ('Immune System', 'Infection'):
+        lines.append('%s:' % army)
+        for _ in range(size):
+            kinds = rng.sample(attack_types, rng.randint(0, 3))
+            weaknesses, immunities = kinds[:len(kinds) // 2], kinds[len(kinds) // 2:]
+            props = '; '.join(
+                '%s to %s' % (name, ', '.join(values))
+                for name, values in (('weak', weaknesses), ('immune', immunities)) if values
+            )
+            lines.append(
+                '%d units each with %d hit points %swith an attack that does %d %s damage at initiative %d' % (
+                    rng.randint(10, 5000),
+                    rng.randint(1000, 50000),
+                    '(%s) ' % props if props else '',
+                    rng.randint(5, 500),
+                    rng.choice(attack_types),
+                    initiatives.pop()
+                )
+            )
+        lines.append('')
+    return '\n'.join(lines)
+
+
 def solution1(data, suppress_print=True):
     immune_system, infection = deepcopy(data['immune_system']), deepcopy(data['infection'])
     prev_immune_system = None
     prev_infection = None
+    compute_attacks = stats.counted(_compute_attacks, 'rounds')
     while immune_system and infection:
         if not suppress_print:
             print()
             print(immune_system)
             print(infection)
-        attacks = _compute_attacks(immune_system, infection)
+        attacks = compute_attacks(immune_system, infection)
         for attack in attacks:
             killed, actual_attack = _apply(attack)
             if killed > 0 and not suppress_print:
@@ -152,6 +186,7 @@ def solution2(data):
     units = -1
     winner = 'Infection'
     while winner == 'Infection':
+        progress.checkpoint(boost=boost)
         immune_system, infection = deepcopy(data['immune_system']), deepcopy(data['infection'])
         immune_system.boost(boost)
         units, winner = solution1({'immune_system': immune_system, 'infection': infection}, suppress_print=True)
@@ -161,6 +196,7 @@ def solution2(data):
     boost = round((min_b + max_b) / 2)
     prev_boost = 0
     while True:
+        progress.checkpoint(boost=boost)
         immune_system, infection = deepcopy(data['immune_system']), deepcopy(data['infection'])
         immune_system.boost(boost)
         units, winner = solution1({'immune_system': immune_system, 'infection': infection}, suppress_print=True)
@@ -180,26 +216,16 @@ def solution2(data):
 
 
 def _parse_content(content):
-    immune_system = infection = army = None
-    i = 0
-    for line in content.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-
-        if line == 'Immune System:':
-            immune_system = army = Army(line[:-1])
-            i = 0
-        elif line == 'Infection:':
-            infection = army = Army(line[:-1])
-            i = 0
-        else:
-            m = re.match(UNIT_LINE, line)
-            if not m:
-                raise Exception('Invalid input line: %s' % line)
-            i += 1
-            army.add_unit(Unit(m, army.name, i))
-    return {'immune_system': immune_system, 'infection': infection}
+    armies = {}
+    # ['', 'Immune System', <its groups>, 'Infection', <its groups>], groups are matched per army in one pass
+    parts = re.split(ARMY_LINE, content)
+    for name, groups in zip(parts[1::2], parts[2::2]):
+        army = armies[name] = Army(name)
+        for i, m in enumerate(UNIT_LINE.finditer(groups), start=1):
+            army.add_unit(Unit(m, name, i))
+        if len(army.units) != sum(1 for line in groups.splitlines() if line.strip()):
+            raise Exception('Invalid input line in %s:%s' % (name, groups))
+    return {'immune_system': armies.get('Immune System'), 'infection': armies.get('Infection')}
 
 
 def _compute_attacks(immune_system, infection):
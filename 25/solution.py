@@ -52,6 +52,13 @@ def _parse_contents(content):
     return points
 
 
+def generate_input(size, rng, extent=8):
+    """`size` random points in 4 dimensions, every coordinate between -`extent` and `extent`"""
+    return ''.join(
+        '%d,%d,%d,%d\n' % tuple(rng.randint(-extent, extent) for _ in range(4)) for _ in range(size)
+    )
+
+
 def _manhattan_distance(p1, p2):
     return sum(abs(i1 - i2) for i1, i2 in zip(p1, p2))
 
@@ -0,0 +1,95 @@
+import json
+import os
+
+from aoc import bench
+
+BASELINE_FILE = 'baselines.json'
+MIN_DELTA_NS = 10**6
+
+
+def load(filename=BASELINE_FILE):
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save(baselines, filename=BASELINE_FILE):
+    with open(filename, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def make_entry(record, peaks):
+    return {
+        'timestamp': record['timestamp'],
+        'python': record['python'],
+        'host': record['host'],
+        'repeat': record['repeat'],
+        'phases': {
+            phase: {
+                'min_ns': record['phases'][phase]['min_ns'],
+                'median_ns': record['phases'][phase]['median_ns'],
+                'peak_bytes': peaks[phase],
+            }
+            for phase in record['phases']
+        },
+    }
+
+
+def compare(baseline, current, threshold, memory_threshold=None, min_delta_ns=MIN_DELTA_NS):
+    """Compare the median time (and optionally the peak memory) of every phase against the baseline
+
+    Thresholds are percentages: a phase regresses when it is more than `threshold` percent slower
+    and at least `min_delta_ns` slower, so sub-millisecond phases don't fail on timer noise.
+    """
+    rows = []
+    for phase in bench.ALL_PHASES:
+        if phase not in baseline['phases'] or phase not in current['phases']:
+            continue
+        base, now = baseline['phases'][phase], current['phases'][phase]
+        time_change = _change(base['median_ns'], now['median_ns'])
+        memory_change = _change(base['peak_bytes'], now['peak_bytes'])
+        slower = now['median_ns'] - base['median_ns'] >= min_delta_ns
+        regressed = (slower and time_change > threshold) or (
+            memory_threshold is not None and memory_change > memory_threshold
+        )
+        rows.append({
+            'phase': phase,
+            'base_ns': base['median_ns'],
+            'now_ns': now['median_ns'],
+            'time_change': time_change,
+            'base_bytes': base['peak_bytes'],
+            'now_bytes': now['peak_bytes'],
+            'memory_change': memory_change,
+            'regressed': regressed,
+        })
+    return rows
+
+
+def report(day, rows):
+    print('Day %s' % day)
+    print(
+        '%-12s %12s %12s %9s %12s %12s %9s' % (
+            'phase', 'base (ms)', 'now (ms)', 'change', 'base (KiB)', 'now (KiB)', 'change'
+        )
+    )
+    for row in rows:
+        print(
+            '%-12s %12.3f %12.3f %+8.1f%% %12.1f %12.1f %+8.1f%%%s' % (
+                row['phase'],
+                row['base_ns'] / 1e6,
+                row['now_ns'] / 1e6,
+                row['time_change'],
+                row['base_bytes'] / 1024,
+                row['now_bytes'] / 1024,
+                row['memory_change'],
+                '  REGRESSION' if row['regressed'] else ''
+            )
+        )
+
+
+def _change(base, now):
+    if base == 0:
+        return 0.0 if now == 0 else float('inf')
+    return (now - base) * 100.0 / base
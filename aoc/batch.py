@@ -0,0 +1,65 @@
+import glob
+import importlib
+import os
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from aoc import bench
+
+_module = None  # the day module, imported once per worker process
+
+
+def input_files(pattern):
+    """Lazily list a directory or expand a glob, so huge batches don't have to fit in memory"""
+    if os.path.isdir(pattern):
+        return (entry.path for entry in os.scandir(pattern) if entry.is_file())
+    return (path for path in glob.iglob(pattern) if os.path.isfile(path))
+
+
+def run(day, filenames, workers=None, window=None):
+    """Solve every input in a process pool, yield one record per input as soon as it is done
+
+    At most `window` inputs are in flight at any time.
+    """
+    window = window or 4 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init, initargs=(day, )) as executor:
+        pending = set()
+        for filename in filenames:
+            if len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(solve, filename))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def solve(filename):
+    record = {'input': filename, 'answers': {}, 'timings': {}, 'error': None}
+    phase = 'read_input'
+    try:
+        with bench.silenced(True):
+            s = time.perf_counter()
+            data = _module.read_input(filename)
+            record['timings'][phase] = time.perf_counter() - s
+            state = ()
+            if hasattr(_module, 'shared_state'):
+                phase = 'shared_state'
+                s = time.perf_counter()
+                state = (_module.shared_state(data), )
+                record['timings'][phase] = time.perf_counter() - s
+            for phase in bench.PHASES[1:]:
+                s = time.perf_counter()
+                record['answers'][phase] = getattr(_module, phase)(data, *state)
+                record['timings'][phase] = time.perf_counter() - s
+    except Exception as e:
+        record['error'] = '%s failed: %s: %s' % (phase, type(e).__name__, e)
+    return record
+
+
+def _init(day):
+    global _module
+    _module = importlib.import_module('%s.solution' % day)
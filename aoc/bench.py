@@ -0,0 +1,133 @@
+import contextlib
+import json
+import math
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+
+PHASES = ('read_input', 'solution1', 'solution2')
+# days 3, 10, 13 and 17 compute the work both parts build on once, in shared_state(data), which they are then passed
+ALL_PHASES = ('read_input', 'shared_state', 'solution1', 'solution2')
+
+
+def phases(module):
+    """The phases of a day in the order they run, shared_state only if the day declares it"""
+    return tuple(phase for phase in ALL_PHASES if phase in PHASES or hasattr(module, phase))
+
+
+def measure(module, filename, warmup=1, repeat=10, quiet=True):
+    """Run every phase warmup + repeat times, keep only the timed samples (ns)"""
+    samples = {phase: [] for phase in phases(module)}
+    for i in range(warmup + repeat):
+        timings = _run_phases(module, filename, quiet, _time_phase)
+        if i < warmup:
+            continue
+        for phase, elapsed in timings.items():
+            samples[phase].append(elapsed)
+    return samples
+
+
+def measure_peak_memory(module, filename, quiet=True):
+    """Run every phase once under tracemalloc, return the peak bytes allocated by each phase"""
+    tracemalloc.start()
+    try:
+        return _run_phases(module, filename, quiet, _trace_phase)
+    finally:
+        tracemalloc.stop()
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'n': len(ordered),
+        'min_ns': ordered[0],
+        'median_ns': int(statistics.median(ordered)),
+        'p95_ns': _percentile(ordered, 95),
+        'stddev_ns': int(statistics.stdev(ordered)) if len(ordered) > 1 else 0,
+    }
+
+
+def make_record(day, samples, warmup):
+    return {
+        'day': day,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'host': platform.node(),
+        'warmup': warmup,
+        'repeat': len(samples[PHASES[0]]),
+        'phases': {
+            phase: dict(summarize(phase_samples), samples_ns=phase_samples)
+            for phase, phase_samples in samples.items()
+        },
+    }
+
+
+def write_record(record, filename):
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filename, 'w') as f:
+        json.dump(record, f, indent=2)
+
+
+def report(record):
+    print('Day %s: %d runs after %d warmup' % (record['day'], record['repeat'], record['warmup']))
+    print('%-12s %12s %12s %12s %12s' % ('phase', 'min (ms)', 'median (ms)', 'p95 (ms)', 'stddev (ms)'))
+    for phase in (phase for phase in ALL_PHASES if phase in record['phases']):
+        stats = record['phases'][phase]
+        print(
+            '%-12s %12.3f %12.3f %12.3f %12.3f' % (
+                phase,
+                _ms(stats['min_ns']),
+                _ms(stats['median_ns']),
+                _ms(stats['p95_ns']),
+                _ms(stats['stddev_ns'])
+            )
+        )
+
+
+@contextlib.contextmanager
+def silenced(quiet):
+    if not quiet:
+        yield
+        return
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _run_phases(module, filename, quiet, probe):
+    results = {}
+    with silenced(quiet):
+        data = probe(results, 'read_input', module.read_input, filename)
+        state = ()
+        if hasattr(module, 'shared_state'):
+            state = (probe(results, 'shared_state', module.shared_state, data), )
+        for phase in PHASES[1:]:
+            probe(results, phase, getattr(module, phase), data, *state)
+    return results
+
+
+def _time_phase(results, phase, func, *args):
+    s = time.perf_counter_ns()
+    r = func(*args)
+    results[phase] = time.perf_counter_ns() - s
+    return r
+
+
+def _trace_phase(results, phase, func, *args):
+    start, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    r = func(*args)
+    results[phase] = tracemalloc.get_traced_memory()[1] - start
+    return r
+
+
+def _percentile(ordered, p):
+    rank = max(1, math.ceil(p / 100.0 * len(ordered)))  # nearest-rank method
+    return ordered[rank - 1]
+
+
+def _ms(ns):
+    return ns / 1e6
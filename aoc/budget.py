@@ -0,0 +1,112 @@
+import functools
+import multiprocessing
+import sys
+import time
+
+from aoc import progress
+
+GRACE = 2.0  # seconds a solver gets to reach a checkpoint after its budget ran out before it is killed
+PROGRESS_INTERVAL = 0.1
+
+_conn = None
+_budgets = {}
+
+
+def parse(spec, phases):
+    """'30' gives every phase 30 seconds, 'solution2=60,read_input=5' only the phases listed"""
+    if '=' not in spec:
+        return {phase: float(spec) for phase in phases}
+    budgets = {}
+    for part in spec.split(','):
+        phase, seconds = part.split('=')
+        if phase not in phases:
+            raise ValueError('unknown phase %r' % phase)
+        budgets[phase] = float(seconds)
+    return budgets
+
+
+def run(func, budgets):
+    """Run func() in a worker process where the phases wrapped with guarded() get a time budget
+
+    A phase over its budget is stopped at its next progress checkpoint, or terminated
+    GRACE seconds later if it doesn't reach one. Returns the exit code of the worker.
+    """
+    context = multiprocessing.get_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_worker, args=(sender, func, budgets))
+    process.start()
+    sender.close()
+    phase, deadline, state = None, None, {}
+    while True:
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not receiver.poll(timeout):
+            process.terminate()
+            print(
+                '%s exceeded its budget of %s seconds and was terminated, last progress: %s' % (
+                    phase, budgets[phase], progress.describe(state)
+                )
+            )
+            break
+        try:
+            kind, phase_name, payload = receiver.recv()
+        except EOFError:  # the worker is done
+            break
+        if kind == 'start':
+            phase, state = phase_name, {}
+            deadline = time.monotonic() + budgets[phase] + GRACE if phase in budgets else None
+        elif kind == 'progress':
+            state = payload
+        elif kind == 'done':
+            phase, deadline = None, None
+        elif kind == 'cancelled':
+            print(
+                '%s stopped after its budget of %s seconds, last progress: %s' % (
+                    phase_name, budgets[phase_name], progress.describe(payload)
+                )
+            )
+            deadline = None
+    process.join()
+    return process.exitcode
+
+
+def guarded(func):
+    """Wrap a phase so that, inside a run() worker, it reports its progress and honours its budget"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        phase = func.__name__
+        _conn.send(('start', phase, None))
+        progress.start(_budgets.get(phase), listener=_throttled_sender(phase))
+        try:
+            r = func(*args, **kwargs)
+        except progress.BudgetExceeded as e:
+            _conn.send(('cancelled', phase, e.state))
+            raise
+        finally:
+            progress.stop()
+        _conn.send(('done', phase, None))
+        return r
+
+    return wrapper
+
+
+def _throttled_sender(phase):
+    last = [0.0]
+
+    def send(state):
+        now = time.monotonic()
+        if now - last[0] >= PROGRESS_INTERVAL:
+            last[0] = now
+            _conn.send(('progress', phase, state))
+
+    return send
+
+
+def _worker(conn, func, budgets):
+    global _conn, _budgets
+    _conn, _budgets = conn, budgets
+    try:
+        func()
+    except progress.BudgetExceeded:
+        sys.exit(2)
+    finally:
+        sys.stdout.flush()
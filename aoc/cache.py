@@ -0,0 +1,122 @@
+import glob
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+CACHE_DIR = '.cache'
+MAGIC = b'AOC-CACHE-1\n'
+
+MISSING = object()
+
+
+def day_key(day, filename):
+    """Content hash of the day's solution module, its input file (if it has one) and the shared aoc code
+
+    The key starts with the day and a hash of the input's path, entries of other inputs are never pruned.
+    """
+    source = hashlib.sha256(os.path.abspath(filename).encode()).hexdigest()[:8]
+    h = hashlib.sha256()
+    paths = ['%s/solution.py' % day, filename] + sorted(glob.glob(os.path.join('aoc', '*.py')))
+    for path in paths:
+        if os.path.isfile(path):  # day 14 has no input file, its read_input ignores the filename
+            with open(path, 'rb') as f:
+                h.update(path.encode() + f.read())
+    h.update(sys.version.encode())  # pickled objects are not guaranteed to load on another interpreter
+    return '%s-%s-%s' % (day, source, h.hexdigest()[:20])
+
+
+def load(key, kind):
+    path = _path(key, kind)
+    try:
+        with open(path, 'rb') as f:
+            blob = f.read()
+    except FileNotFoundError:
+        return MISSING
+    value = _decode(blob)
+    if value is MISSING:
+        print('Discarding corrupt cache file %s' % path)
+        _remove(path)
+    return value
+
+
+def store(key, kind, value):
+    try:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        print('Not caching %s for %s: %s' % (kind, key, e))
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _prune(key, kind)
+    path = _path(key, kind)
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC + hashlib.sha256(payload).digest() + payload)
+    os.replace(tmp, path)  # atomic, concurrent runs never see a partial file
+
+
+def cached(key, kind, compute):
+    value = load(key, kind)
+    if value is MISSING:
+        value = compute()
+        store(key, kind, value)
+    return value
+
+
+def _decode(blob):
+    header = len(MAGIC) + hashlib.sha256().digest_size
+    if not blob.startswith(MAGIC) or len(blob) < header:
+        return MISSING
+    digest, payload = blob[len(MAGIC):header], blob[header:]
+    if hashlib.sha256(payload).digest() != digest:
+        return MISSING
+    try:
+        return pickle.loads(payload)
+    except Exception:  # e.g. a class that was renamed since the entry was written
+        return MISSING
+
+
+def _prune(key, kind):
+    """Remove entries of the same input and kind left behind by older versions of the input or solution"""
+    source = key.rsplit('-', 1)[0]
+    for path in glob.glob(os.path.join(CACHE_DIR, '%s-*.%s.pickle' % (source, kind))):
+        if path != _path(key, kind):
+            _remove(path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:  # already removed by a concurrent run
+        pass
+
+
+def _path(key, kind):
+    return os.path.join(CACHE_DIR, '%s.%s.pickle' % (key, kind))
+
+
+def test_store():
+    global CACHE_DIR
+    cache_dir = CACHE_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        CACHE_DIR = directory
+        try:
+            default, other = os.path.join(directory, 'input.txt'), os.path.join(directory, 'other.txt')
+            for filename, contents in ((default, '1'), (other, '2')):
+                with open(filename, 'w') as f:
+                    f.write(contents)
+            store(day_key('01', default), 'answer1', 1)
+            store(day_key('01', other), 'answer1', 2)
+            assert 1 == load(day_key('01', default), 'answer1')
+            assert 2 == load(day_key('01', other), 'answer1')
+
+            stale = day_key('01', default)
+            with open(default, 'w') as f:
+                f.write('3')
+            store(day_key('01', default), 'answer1', 3)
+            assert MISSING is load(stale, 'answer1')
+            assert 3 == load(day_key('01', default), 'answer1')
+            assert 2 == load(day_key('01', other), 'answer1')
+        finally:
+            CACHE_DIR = cache_dir
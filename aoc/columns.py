@@ -0,0 +1,24 @@
+import re
+
+from aoc.lazy import lazy_import
+
+np = lazy_import('numpy')
+
+INTEGER = re.compile(r'-?\d+')
+
+
+def integers(text, fields):
+    """All integers of `text` as a record array with one int64 column per field
+
+    A single findall runs over the whole text, so every record (line) must hold exactly
+    len(fields) integers, in the order of `fields`.
+    """
+    values = np.fromstring(' '.join(INTEGER.findall(text)), dtype=np.int64, sep=' ')
+    if len(values) % len(fields):
+        raise ValueError('%d integers do not split into records of %d fields' % (len(values), len(fields)))
+    return np.rec.fromarrays(values.reshape(-1, len(fields)).T, names=fields)
+
+
+def read_integers(filename, fields):
+    with open(filename) as f:
+        return integers(f.read(), fields)
@@ -0,0 +1,76 @@
+from collections import namedtuple
+
+from aoc import progress
+
+Cycle = namedtuple('Cycle', ['start', 'length'])
+
+
+def fast_forward(state, step, n, key=None, offset=None):
+    """The state after n steps, skipping whole cycles as soon as the canonical states repeat
+
+    `step(state)` returns the next state without modifying its argument, `key(state)` its canonical,
+    hashable form. For states that repeat up to a translation `offset(state)` gives their position.
+    Returns (state, moved, cycle): moved is how far the skipped cycles translated the state and
+    cycle is None if nothing repeated within n steps.
+
+    Uses Brent's algorithm, so only two states are kept in memory whatever the cycle length.
+    """
+    key = key or _identity
+    if n == 0:
+        return state, 0, None
+    # the cycle length: the tortoise waits at powers of two until the hare comes around
+    power = length = 1
+    tortoise = key(state)
+    hare = step(state)
+    steps = 1
+    while tortoise != key(hare):
+        if steps == n:
+            return hare, 0, None
+        if power == length:
+            tortoise = key(hare)
+            power *= 2
+            length = 0
+        hare = step(hare)
+        length += 1
+        steps += 1
+        progress.checkpoint(generation=steps)
+    # the first state of the cycle: walk two states `length` steps apart until they meet
+    tortoise = hare = state
+    for _ in range(length):
+        hare = step(hare)
+    start = 0
+    while key(tortoise) != key(hare):
+        tortoise, hare = step(tortoise), step(hare)
+        start += 1
+    cycles, remainder = divmod(n - start, length)
+    moved = cycles * (offset(hare) - offset(tortoise)) if offset else 0
+    for _ in range(remainder):
+        tortoise = step(tortoise)
+    return tortoise, moved, Cycle(start, length)
+
+
+def _identity(state):
+    return state
+
+
+def test_fast_forward():
+    def square(x):
+        return (x * x + 1) % 255
+
+    x = 3
+    for n in range(300):
+        state, moved, cycle = fast_forward(3, square, n)
+        assert (x, 0) == (state, moved), n
+        x = square(x)
+    assert (2, 6) == cycle  # a tail of 2 states before the cycle
+
+    def walk(state):
+        position, phase = state
+        return position + phase, (phase + 1) % 5
+
+    state = (0, 0)
+    for n in range(100):
+        (position, phase), moved, cycle = fast_forward((0, 0), walk, n, key=lambda s: s[1], offset=lambda s: s[0])
+        assert state == (position + moved, phase), n
+        state = walk(state)
+    assert (0, 5) == cycle
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import signal
+import socket
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+from aoc import bench, cache, scheduler
+
+SOCKET_PATH = os.path.join(cache.CACHE_DIR, 'daemon.sock')
+PARTS = (1, 2)
+INPUTS_KEPT = 32  # parsed inputs each worker keeps, with their shared state and answers
+WARM_MODULES = ('numpy', )  # loaded in every worker up front, the solvers only import it lazily
+
+_modules = {}  # day -> (module, mtime of its solution.py), per worker process
+_inputs = {}
+
+
+def serve(path=SOCKET_PATH, workers=None, days=None):
+    """Answer solve requests on the Unix socket `path` until SIGINT or SIGTERM
+
+    Every line a client sends is a JSON request
+    {"day": 5, "part": 1 or 2 (optional, default both), "input": path or "contents": text (default the day's input)}
+    and gets one JSON line back: {"day", "answers": {part: answer}, "timings": {phase: seconds}, "cached", "error"}.
+    """
+    days = days or scheduler.available_days()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)  # left behind by a daemon that was killed
+    try:
+        asyncio.run(_serve(path, workers, days))
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def request(payload, path=SOCKET_PATH):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall((json.dumps(payload) + '\n').encode())
+        with s.makefile('r') as f:
+            return json.loads(f.readline())
+
+
+def solve(payload):
+    """Solve one request in a worker process, reusing the modules and inputs of earlier requests
+
+    Answers, parsed inputs and shared state of input files also go through the on-disk cache that run.py uses.
+    """
+    record = {'day': None, 'answers': {}, 'timings': {}, 'cached': False, 'error': None}
+    phase = 'request'
+    try:
+        day = '%02d' % int(payload['day'])
+        record['day'] = day
+        parts = (int(payload['part']), ) if payload.get('part') else PARTS
+        if any(part not in PARTS for part in parts):
+            raise ValueError('no part %s' % payload['part'])
+        module = _module(day)
+        with bench.silenced(True):
+            phase = 'read_input'
+            entry = _input(module, day, payload, record)
+            cached = True
+            for part in parts:
+                phase = 'solution%d' % part
+                if part not in entry['answers']:
+                    answer = cache.load(entry['key'], 'answer%d' % part) if entry['key'] else cache.MISSING
+                    if answer is cache.MISSING:
+                        answer = _solve_part(module, entry, part, record)
+                        cached = False
+                        if entry['key']:
+                            cache.store(entry['key'], 'answer%d' % part, answer)
+                    entry['answers'][part] = answer
+                record['answers'][part] = entry['answers'][part]
+            record['cached'] = cached
+    except Exception as e:
+        record['error'] = '%s failed: %s: %s' % (phase, type(e).__name__, e)
+    return record
+
+
+async def _serve(path, workers, days):
+    # one single process pool per worker, every day always goes to the same one, which keeps its inputs warm
+    executors = [
+        ProcessPoolExecutor(max_workers=1, initializer=_init, initargs=(days, ))
+        for _ in range(workers or os.cpu_count() or 1)
+    ]
+    try:
+        server = await asyncio.start_unix_server(lambda r, w: _handle(r, w, executors), path=path)
+        stopped = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stopped.set)
+        print('Serving days %s on %s' % (', '.join(days), path), flush=True)
+        async with server:
+            await stopped.wait()
+        print('Stopped serving on %s' % path)
+    finally:
+        for executor in executors:
+            executor.shutdown()
+
+
+async def _handle(reader, writer, executors):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                payload = json.loads(line)
+            except ValueError as e:
+                response = {'error': 'invalid request: %s' % e}
+            else:
+                executor = executors[_route(payload) % len(executors)]
+                response = await loop.run_in_executor(executor, solve, payload)
+            writer.write((json.dumps(response, default=str) + '\n').encode())
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+def _route(payload):
+    try:
+        return int(payload['day'])
+    except (KeyError, TypeError, ValueError):  # solve() reports the bad request
+        return 0
+
+
+def _init(days):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C reaches the whole process group, the server stops the pool
+    for name in WARM_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    for day in days:
+        try:
+            _module(day)
+        except ImportError:  # e.g. day 9 without blist, reported when it is requested
+            pass
+
+
+def _module(day):
+    """The day module, imported again when its solution.py changed since it was loaded"""
+    mtime = os.stat('%s/solution.py' % day).st_mtime_ns
+    if day in _modules and _modules[day][1] == mtime:
+        return _modules[day][0]
+    module = importlib.import_module('%s.solution' % day)
+    if day in _modules:
+        module = importlib.reload(module)
+    _modules[day] = (module, mtime)
+    return module
+
+
+def _input(module, day, payload, record):
+    if 'contents' in payload:
+        key = (day, hashlib.sha256(payload['contents'].encode()).hexdigest())
+        disk_key = None
+    else:
+        filename = payload.get('input') or '%s/input.txt' % day
+        if os.path.isfile(filename):
+            st = os.stat(filename)
+            key = (day, os.path.abspath(filename), st.st_mtime_ns, st.st_size)
+        else:  # day 14 has no input file, its read_input ignores the filename
+            key = (day, os.path.abspath(filename))
+        disk_key = cache.day_key(day, filename)
+    key += (_modules[day][1], )
+    if key in _inputs:
+        return _inputs[key]
+    if 'contents' in payload:
+        s = time.perf_counter()
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+            f.write(payload['contents'])
+            f.flush()
+            data = module.read_input(f.name)
+        record['timings']['read_input'] = time.perf_counter() - s
+    else:
+        data = cache.cached(disk_key, 'input', lambda: _timed(module.read_input, filename, record))
+    if len(_inputs) >= INPUTS_KEPT:
+        del _inputs[next(iter(_inputs))]
+    _inputs[key] = {'data': data, 'key': disk_key, 'state': None, 'answers': {}}
+    return _inputs[key]
+
+
+def _solve_part(module, entry, part, record):
+    state = ()
+    if hasattr(module, 'shared_state'):
+        if entry['state'] is None:
+            compute = lambda: _timed(module.shared_state, entry['data'], record)
+            entry['state'] = cache.cached(entry['key'], 'shared_state', compute) if entry['key'] else compute()
+        state = (entry['state'], )
+    return _timed(getattr(module, 'solution%d' % part), entry['data'], record, *state)
+
+
+def _timed(func, data, record, *state):
+    s = time.perf_counter()
+    r = func(data, *state)
+    record['timings'][func.__name__] = time.perf_counter() - s
+    return r
@@ -0,0 +1,238 @@
+import time
+
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+OPCODES = (
+    'addr', 'addi',
+    'mulr', 'muli',
+    'banr', 'bani',
+    'borr', 'bori',
+    'setr', 'seti',
+    'gtir', 'gtri', 'gtrr',
+    'eqir', 'eqri', 'eqrr'
+)
+
+# ip is the register bound to the instruction pointer (None if there is none), code holds
+# 4 ints per instruction: the index of the opcode in OPCODES followed by its operands a, b and c
+Program = namedtuple('Program', ['ip', 'code'])
+
+
+def parse(text):
+    """Elfcode source: an optional '#ip <register>' line followed by one 'opcode a b c' per line"""
+    lines = text.strip().splitlines()
+    ip = None
+    if lines and lines[0].startswith('#ip'):
+        ip = int(lines[0][3:])
+        lines = lines[1:]
+    instructions = []
+    for line in lines:
+        name, a, b, c = line.split()
+        instructions.append((name, int(a), int(b), int(c)))
+    return Program(ip, encode(instructions))
+
+
+def encode(instructions):
+    """(opcode name, a, b, c) tuples to a flat code array"""
+    code = array('q')
+    for name, a, b, c in instructions:
+        code.extend((OPCODES.index(name), a, b, c))
+    return code
+
+
+def execute(name, registers, a, b, c):
+    """Apply a single instruction to `registers` in place"""
+    instruction(name, a, b, c)(registers)
+
+
+@lru_cache(maxsize=4096)
+def instruction(name, a, b, c):
+    """A single instruction compiled to a function of the registers, which it changes in place
+
+    Day 16 tries every opcode on the same few operands, each combination is compiled once.
+    """
+    return _STEPS[OPCODES.index(name)](a, b, c)
+
+
+class Machine:
+    """Runs a decoded program, every instruction compiled to a closure over its operands"""
+
+    def __init__(self, program, registers=6):
+        self.ip = registers if program.ip is None else program.ip  # a hidden register when not bound
+        self.n = registers
+        code = program.code
+        self.steps = [_STEPS[code[i]](code[i + 1], code[i + 2], code[i + 3]) for i in range(0, len(code), 4)]
+        self.regs = [0] * (registers + int(program.ip is None))
+        self.pointer = 0
+        self.executed = 0
+        self.elapsed = 0.0
+
+    @property
+    def registers(self):
+        return self.regs[:self.n]
+
+    def reset(self, reg0=0):
+        self.regs = [0] * len(self.regs)
+        self.regs[0] = reg0
+        self.pointer = 0
+
+    def run(self, limit=-1, breakpoint=-1):
+        """Run until the program halts, `limit` instructions ran or the pointer reaches `breakpoint`
+
+        Returns True if the program halted.
+        """
+        steps, r, ip, size = self.steps, self.regs, self.ip, len(self.steps)
+        p = self.pointer
+        n = 0
+        s = time.perf_counter()
+        while 0 <= p < size and p != breakpoint and n != limit:
+            r[ip] = p
+            steps[p](r)
+            p = r[ip] + 1
+            n += 1
+        r[ip] = p
+        self.elapsed += time.perf_counter() - s
+        self.executed += n
+        self.pointer = p
+        return not 0 <= p < size
+
+    def speed(self):
+        """Instructions per second over all runs so far"""
+        return self.executed / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        print('Executed %d instructions in %f seconds (%.0f per second)' % (self.executed, self.elapsed, self.speed()))
+
+
+def _addr(a, b, c):
+    def step(r):
+        r[c] = r[a] + r[b]
+    return step
+
+
+def _addi(a, b, c):
+    def step(r):
+        r[c] = r[a] + b
+    return step
+
+
+def _mulr(a, b, c):
+    def step(r):
+        r[c] = r[a] * r[b]
+    return step
+
+
+def _muli(a, b, c):
+    def step(r):
+        r[c] = r[a] * b
+    return step
+
+
+def _banr(a, b, c):
+    def step(r):
+        r[c] = r[a] & r[b]
+    return step
+
+
+def _bani(a, b, c):
+    def step(r):
+        r[c] = r[a] & b
+    return step
+
+
+def _borr(a, b, c):
+    def step(r):
+        r[c] = r[a] | r[b]
+    return step
+
+
+def _bori(a, b, c):
+    def step(r):
+        r[c] = r[a] | b
+    return step
+
+
+def _setr(a, b, c):
+    def step(r):
+        r[c] = r[a]
+    return step
+
+
+def _seti(a, b, c):
+    def step(r):
+        r[c] = a
+    return step
+
+
+def _gtir(a, b, c):
+    def step(r):
+        r[c] = int(a > r[b])
+    return step
+
+
+def _gtri(a, b, c):
+    def step(r):
+        r[c] = int(r[a] > b)
+    return step
+
+
+def _gtrr(a, b, c):
+    def step(r):
+        r[c] = int(r[a] > r[b])
+    return step
+
+
+def _eqir(a, b, c):
+    def step(r):
+        r[c] = int(a == r[b])
+    return step
+
+
+def _eqri(a, b, c):
+    def step(r):
+        r[c] = int(r[a] == b)
+    return step
+
+
+def _eqrr(a, b, c):
+    def step(r):
+        r[c] = int(r[a] == r[b])
+    return step
+
+
+_STEPS = [globals()['_' + name] for name in OPCODES]
+
+
+def test_execute():
+    expected = {
+        'addr': 9, 'addi': 6, 'mulr': 20, 'muli': 8, 'banr': 4, 'bani': 0, 'borr': 5, 'bori': 6,
+        'setr': 4, 'seti': 1, 'gtir': 0, 'gtri': 1, 'gtrr': 0, 'eqir': 0, 'eqri': 0, 'eqrr': 0
+    }
+    for name in OPCODES:
+        registers = [0, 4, 5, 0]
+        execute(name, registers, 1, 2, 3)  # a=1, b=2: r[1] = 4, r[2] = 5
+        assert [0, 4, 5, expected[name]] == registers, name
+    registers = [0, 4, 4, 0]
+    execute('eqrr', registers, 1, 2, 3)
+    assert 1 == registers[3]
+
+
+def test_machine():
+    # without #ip the pointer lives in a hidden register, jumps are not possible
+    program = parse('seti 3 0 0\naddi 0 4 1\nmulr 1 1 2')
+    assert (None, [9, 3, 0, 0, 1, 0, 4, 1, 2, 1, 1, 2]) == (program.ip, list(program.code))
+    machine = Machine(program, registers=4)
+    assert machine.run()
+    assert [3, 7, 49, 0] == machine.registers and 3 == machine.executed
+
+    # r0 counts down from 3 and jumps back with the bound pointer in r1
+    loop = parse('#ip 1\naddi 0 -1 0\ngtri 0 0 2\naddr 1 2 1\nseti 5 0 1\nseti -1 0 1')
+    machine = Machine(loop, registers=3)
+    machine.reset(3)
+    assert not machine.run(limit=4)
+    assert (0, 2) == (machine.pointer, machine.registers[0])
+    assert not machine.run(breakpoint=3)
+    assert (3, 0) == (machine.pointer, machine.registers[0])
+    assert machine.run()
+    assert [0, 6, 0] == machine.registers
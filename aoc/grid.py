@@ -0,0 +1,110 @@
+class Grid:
+    """A rectangular map with one byte per cell, stored row after row in a flat bytearray
+
+    Cells are read and written as grid[row, column] or through their flat index in `cells`;
+    adding one of `offsets4` (reading order) or `offsets8` to an index gives a neighbour.
+    With a `border` byte the grid is framed by one cell of it, so neighbours of edge cells
+    can be looked up without bounds checks.
+    """
+
+    def __init__(self, height, width, fill=b'.', border=None):
+        self.height = height
+        self.width = width
+        self.border = border
+        pad = 0 if border is None else 1
+        self.stride = width + 2 * pad
+        self.origin = pad * self.stride + pad
+        if pad:
+            self.cells = bytearray(border * (self.stride * (height + 2)))
+            for row in range(height):
+                self.fill(fill[0], row)
+        else:
+            self.cells = bytearray(fill * (self.stride * height))
+        s = self.stride
+        self.offsets4 = (-s, -1, 1, s)
+        self.offsets8 = (-s - 1, -s, -s + 1, -1, 1, s - 1, s, s + 1)
+
+    @classmethod
+    def from_lines(cls, lines, fill=b' ', border=None):
+        """Lines of text, shorter lines are padded with `fill`"""
+        lines = [line.encode('ascii') for line in lines]
+        grid = cls(len(lines), max(map(len, lines), default=0), fill, border)
+        for row, line in enumerate(lines):
+            start = grid.index(row, 0)
+            grid.cells[start:start + len(line)] = line
+        return grid
+
+    def index(self, row, column):
+        return self.origin + row * self.stride + column
+
+    def position(self, index):
+        return divmod(index - self.origin, self.stride)
+
+    def indices(self):
+        """Flat indices of all cells in reading order, the border excluded"""
+        for row in range(self.height):
+            start = self.origin + row * self.stride
+            yield from range(start, start + self.width)
+
+    def __getitem__(self, position):
+        row, column = position
+        return self.cells[self.origin + row * self.stride + column]
+
+    def __setitem__(self, position, value):
+        row, column = position
+        self.cells[self.origin + row * self.stride + column] = value
+
+    def row(self, row, start=0, stop=None):
+        """The cells row[start:stop] as bytes"""
+        offset = self.origin + row * self.stride
+        stop = self.width if stop is None else stop
+        return bytes(self.cells[offset + start:offset + stop])
+
+    def fill(self, value, row, start=0, stop=None):
+        """Set the cells row[start:stop] to `value`"""
+        offset = self.origin + row * self.stride
+        stop = self.width if stop is None else stop
+        self.cells[offset + start:offset + stop] = bytes((value, )) * (stop - start)
+
+    def count(self, value):
+        n = self.cells.count(value)
+        if self.border is not None and self.border[0] == value:
+            n -= len(self.cells) - self.height * self.width
+        return n
+
+    def copy(self):
+        grid = Grid.__new__(Grid)
+        grid.__dict__.update(self.__dict__)
+        grid.cells = bytearray(self.cells)
+        return grid
+
+    def __eq__(self, other):
+        return isinstance(other, Grid) and str(self) == str(other)
+
+    def __str__(self):
+        return '\n'.join(self.row(row).decode('ascii') for row in range(self.height))
+
+
+def test_grid():
+    grid = Grid.from_lines(['#..', '.#'], fill=b'.', border=b'#')
+    assert (2, 3, 5) == (grid.height, grid.width, grid.stride)
+    assert '#..\n.#.' == str(grid)
+    assert 2 == grid.count(ord('#'))
+    assert (1, 1) == grid.position(grid.index(1, 1))
+    assert [grid.index(0, c) for c in range(3)] + [grid.index(1, c) for c in range(3)] == list(grid.indices())
+    # the border frames the cells, every neighbour of an edge cell is inside the array
+    i = grid.index(0, 0)
+    assert b'####.#.#' == bytes(grid.cells[i + o] for o in grid.offsets8)
+    assert [grid.index(r, c) for r, c in ((-1, 0), (0, -1), (0, 1), (1, 0))] == [i + o for o in grid.offsets4]
+
+    copy = grid.copy()
+    copy[1, 2] = ord('~')
+    copy.fill(ord('|'), 0, 1)
+    assert b'#||' == copy.row(0) and b'~' == copy.row(1, 2)
+    assert '#..\n.#.' == str(grid) and copy != grid
+    copy.fill(ord('.'), 0, 1)
+    copy[1, 2] = ord('.')
+    assert copy == grid
+
+    plain = Grid(1, 2, fill=b'x')
+    assert (bytearray(b'xx'), 0) == (plain.cells, plain.origin)
@@ -0,0 +1,85 @@
+from collections import defaultdict
+
+
+class Index:
+    """Words indexed for "every word within Hamming distance k" queries
+
+    Words of one length are cut into k + 1 segments. Two words that differ in at most k
+    positions have at least one segment without a difference, so only the words sharing
+    one of the query's segments (a bucket of a segment table) are compared. Hamming
+    distance is only defined between words of the same length, others never match.
+    """
+
+    def __init__(self, words, k):
+        self.words = list(words)
+        self.k = k
+        self._tables = {}  # word length -> (segment bounds, one {segment: [word index]} per segment)
+        for i, word in enumerate(self.words):
+            bounds, tables = self._segment_tables(len(word))
+            for table, (start, stop) in zip(tables, bounds):
+                table[word[start:stop]].append(i)
+
+    def query(self, word, k=None):
+        """Sorted indices of the words within distance k (at most the k of the index) of `word`"""
+        k = self.k if k is None else k
+        if k > self.k:
+            raise ValueError('the index only answers queries up to k=%d, not %d' % (self.k, k))
+        if len(word) not in self._tables:
+            return []
+        bounds, tables = self._tables[len(word)]
+        found = set()
+        for table, (start, stop) in zip(tables, bounds):
+            for i in table.get(word[start:stop], ()):
+                if i not in found and distance(word, self.words[i], k) <= k:
+                    found.add(i)
+        return sorted(found)
+
+    def pairs(self):
+        """Every pair of indexed words within distance k of each other as (i, j, distance), i < j
+
+        A pair is compared in the bucket of the first segment its words share, so it is reported once.
+        """
+        for bounds, tables in self._tables.values():
+            for s, (table, (start, stop)) in enumerate(zip(tables, bounds)):
+                for bucket in table.values():
+                    for a, i in enumerate(bucket):
+                        word_i = self.words[i]
+                        for j in bucket[a + 1:]:
+                            word_j = self.words[j]
+                            if any(word_i[b:e] == word_j[b:e] for b, e in bounds[:s]):
+                                continue
+                            d = distance(word_i, word_j, self.k)
+                            if d <= self.k:
+                                yield i, j, d
+
+    def _segment_tables(self, length):
+        if length not in self._tables:
+            n = self.k + 1
+            bounds = [(length * s // n, length * (s + 1) // n) for s in range(n)]
+            self._tables[length] = (bounds, [defaultdict(list) for _ in bounds])
+        return self._tables[length]
+
+
+def distance(a, b, limit=None):
+    """Number of positions where a and b differ, counting stops once it exceeds `limit`"""
+    d = 0
+    for x, y in zip(a, b):
+        if x != y:
+            d += 1
+            if limit is not None and d > limit:
+                break
+    return d
+
+
+def test_index():
+    index = Index(['abcde', 'fghij', 'klmno', 'pqrst', 'fguij', 'axcye', 'wvxyz'], 2)
+    assert [1, 4] == index.query('fghij', 1)
+    assert [0, 5] == index.query('abcde')
+    assert [] == index.query('abc')
+    assert [(0, 5, 2), (1, 4, 1)] == sorted(index.pairs())
+    try:
+        index.query('abcde', 3)
+    except ValueError:
+        pass
+    else:
+        assert False, 'k above the index k must be rejected'
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+TOP = 3
+
+
+def import_time(day):
+    """Import the day module in a fresh interpreter under -X importtime
+
+    Returns the cumulative import time of the module in microseconds and its direct imports
+    as (name, cumulative microseconds), most expensive first.
+    """
+    module = '%s.solution' % day
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', '__import__(%r)' % module],
+        stderr=subprocess.PIPE,
+        universal_newlines=True
+    )
+    if proc.returncode:
+        raise ImportError('Could not import %s:\n%s' % (module, proc.stderr.strip()), name=module)
+    entries = list(_parse(proc.stderr))
+    for i, (name, depth, cumulative) in enumerate(entries):
+        if name == module:
+            return cumulative, _direct_imports(entries, i, depth)
+    raise ImportError('%s missing from the -X importtime output' % module, name=module)
+
+
+def report(rows):
+    print('%-6s %12s   %s' % ('day', 'import (ms)', 'heaviest direct imports'))
+    for day, cumulative, imports in rows:
+        print(
+            '%-6s %12.1f   %s' % (
+                day,
+                cumulative / 1e3,
+                ', '.join('%s %.1f ms' % (name, us / 1e3) for name, us in imports[:TOP])
+            )
+        )
+
+
+def _parse(output):
+    # import time: self [us] | cumulative | imported package
+    for line in output.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+        _, cumulative, raw_name = line[len('import time:'):].split('|')
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        yield name, depth, int(cumulative)
+
+
+def _direct_imports(entries, index, depth):
+    # children are reported before their parent, one level deeper
+    result = []
+    for name, child_depth, cumulative in reversed(entries[:index]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 1:
+            result.append((name, cumulative))
+    return sorted(result, key=lambda entry: -entry[1])
@@ -0,0 +1,115 @@
+import sys
+import threading
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+TOP = 5
+FRAMES = 1
+SNAPSHOT_GROWTH = 1.1  # take a new snapshot only after the traced memory grew by 10 %
+POLL_INTERVAL = 0.02
+
+
+class _PeakWatcher(threading.Thread):
+    """Keep the top allocation sites seen close to the peak
+
+    A snapshot taken after the call only shows what survived, not the temporaries
+    that made up the peak, so poll the traced size and snapshot at every new high.
+    """
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = 0
+        self.top_sites = None
+        self._size = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(POLL_INTERVAL):
+            current, peak = tracemalloc.get_traced_memory()
+            if current > self._size * SNAPSHOT_GROWTH:
+                self.peak = max(self.peak, peak)
+                self.top_sites = _top_sites(tracemalloc.take_snapshot())
+                self._size = current
+                tracemalloc.reset_peak()  # the snapshot itself is traced, don't count it
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def measure(func, *args, **kwargs):
+    """Call func under tracemalloc, return its result and the memory it used
+
+    The peak is approximate: allocations made while a snapshot is being taken are not counted.
+    """
+    rss_before = max_rss()
+    tracemalloc.start(FRAMES)
+    watcher = _PeakWatcher()
+    watcher.start()
+    try:
+        try:
+            r = func(*args, **kwargs)
+        finally:
+            watcher.stop()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    survivors = _filtered(after).statistics('filename')
+    usage = {
+        'peak_bytes': max(peak, watcher.peak),
+        'net_blocks': sum(stat.count for stat in survivors),
+        'net_bytes': sum(stat.size for stat in survivors),
+        'max_rss_growth_bytes': max_rss() - rss_before if rss_before is not None else None,
+        'top_sites': watcher.top_sites or _top_sites(after),
+    }
+    return r, usage
+
+
+def report(name, usage):
+    rss = usage['max_rss_growth_bytes']
+    print(
+        'Memory for %s: peak %s, %d blocks (%s) still allocated, max RSS %s' % (
+            name,
+            _size(usage['peak_bytes']),
+            usage['net_blocks'],
+            _size(usage['net_bytes']),
+            '+' + _size(rss) if rss is not None else 'n/a'
+        )
+    )
+    print('  Top allocation sites near the peak:')
+    for site, size, count in usage['top_sites']:
+        print('    %s: %s in %d blocks' % (site, _size(size), count))
+
+
+def max_rss():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024  # bytes on macOS, KiB elsewhere
+
+
+def _top_sites(snapshot):
+    return [
+        (str(stat.traceback), stat.size, stat.count)
+        for stat in _filtered(snapshot).statistics('lineno')[:TOP]
+    ]
+
+
+def _filtered(snapshot):
+    return snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, threading.__file__),
+        tracemalloc.Filter(False, __file__),
+    ])
+
+
+def _size(n):
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(n) < 1024:
+            return '%.1f %s' % (n, unit)
+        n /= 1024.0
+    return '%.1f GiB' % n
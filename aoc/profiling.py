@@ -0,0 +1,78 @@
+import cProfile
+import functools
+import os
+import pstats
+
+from collections import defaultdict
+
+PROFILE_DIR = 'profile'
+MIN_SECONDS = 1e-6  # stack branches cheaper than this are dropped from the collapsed output
+TOP = 15
+
+_PROFILER_DISABLE = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+
+def profiled(func, day, directory=PROFILE_DIR):
+    """Wrap func so every call runs under its own cProfile and writes <day>-<func name>.pstats/.collapsed"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(func, *args, **kwargs)
+        finally:
+            _write(profiler, day, func.__name__, directory)
+
+    return wrapper
+
+
+def collapse(stats):
+    """Approximate collapsed stacks ("root;caller;callee <microseconds>") from a pstats caller graph
+
+    cProfile only records caller -> callee edges, so the time of a function reached over several
+    paths is split between them in proportion to each edge's cumulative time.
+    """
+    callees = defaultdict(dict)
+    roots = []
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        if not callers and func[2] != _PROFILER_DISABLE:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees[caller][func] = edge
+    result = defaultdict(float)
+    for root in roots:
+        _walk(root, (), 1.0, stats.stats, callees, result)
+    return sorted((stack, int(seconds * 1e6)) for stack, seconds in result.items() if seconds * 1e6 >= 1)
+
+
+def _walk(func, stack, scale, raw_stats, callees, result):
+    _, _, tt, _, _ = raw_stats[func]
+    path = stack + (func, )
+    result[tuple(_label(f) for f in path)] += tt * scale
+    for callee, edge in callees[func].items():
+        callee_ct = raw_stats[callee][3]
+        edge_ct = edge[3] * scale
+        if callee in path or callee_ct <= 0 or edge_ct < MIN_SECONDS:  # recursion is already in the caller's time
+            continue
+        _walk(callee, path, scale * edge[3] / callee_ct, raw_stats, callees, result)
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == '~':  # built-in
+        label = name
+    else:
+        path = os.path.relpath(filename)
+        label = '%s (%s:%d)' % (name, os.path.basename(filename) if path.startswith('..') else path, line)
+    return label.replace(';', ',')
+
+
+def _write(profiler, day, phase, directory):
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, '%s-%s' % (day, phase))
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(base + '.pstats')
+    with open(base + '.collapsed', 'w') as f:
+        for stack, microseconds in collapse(stats):
+            f.write('%s %d\n' % (';'.join(stack), microseconds))
+    print('Profile of %s written to %s.pstats and %s.collapsed' % (phase, base, base))
+    stats.sort_stats('tottime').print_stats(TOP)
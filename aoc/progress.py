@@ -0,0 +1,42 @@
+import time
+
+_deadline = None
+_listener = None
+_state = {}
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, state):
+        super().__init__('time budget exceeded, last progress: %s' % describe(state))
+        self.state = state
+
+
+def start(budget=None, listener=None):
+    """Enable checkpoints: raise BudgetExceeded after `budget` seconds, pass every update to `listener`"""
+    global _deadline, _listener, _state
+    _deadline = time.monotonic() + budget if budget else None
+    _listener = listener
+    _state = {}
+
+
+def stop():
+    global _deadline, _listener
+    _deadline = _listener = None
+
+
+def checkpoint(**state):
+    """Record how far a long running solver got, e.g. checkpoint(elf_power=12)
+
+    Solvers call this from their outer loops; it costs a function call when no budget is set.
+    """
+    if _deadline is None and _listener is None:
+        return
+    _state.update(state)
+    if _listener is not None:
+        _listener(dict(_state))
+    if _deadline is not None and time.monotonic() > _deadline:
+        raise BudgetExceeded(dict(_state))
+
+
+def describe(state):
+    return ', '.join('%s=%s' % item for item in sorted(state.items())) or 'none reported'
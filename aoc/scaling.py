@@ -0,0 +1,87 @@
+import math
+import os
+import random
+import tempfile
+import time
+
+from aoc import bench
+
+QUADRATIC = 1.8  # fitted exponents from here on count as quadratic or worse
+
+
+def sweep(module, sizes, phases=bench.PHASES, repeat=1, seed=0, quiet=True, warmup=1):
+    """Time the phases on a generated input of every size, keeping the fastest of `repeat` runs
+
+    Yields (size, {phase: seconds}) as soon as a size is done. The same seed is used for every
+    size so that inputs only differ in size, not in luck. The phases first run `warmup` times
+    untimed on the first size, lazy imports and other first call costs would skew its timings.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'input.txt')
+        for i, size in enumerate(sizes):
+            with open(filename, 'w') as f:
+                f.write(module.generate_input(size, random.Random(seed)))
+            for _ in range(warmup if i == 0 else 0):
+                _time_phases(module, filename, phases, quiet)
+            best = {}
+            for _ in range(repeat):
+                for phase, elapsed in _time_phases(module, filename, phases, quiet).items():
+                    best[phase] = min(elapsed, best.get(phase, elapsed))
+            yield size, best
+
+
+def fit_exponent(points):
+    """Least squares slope of log(seconds) over log(size): t ~ size ** exponent"""
+    points = [(math.log(size), math.log(seconds)) for size, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def report_header(phases):
+    print('%10s %s' % ('size', ' '.join('%14s' % ('%s (s)' % phase) for phase in phases)))
+
+
+def report_row(size, timings, phases):
+    print('%10d %s' % (size, ' '.join('%14.6f' % timings[phase] for phase in phases)))
+
+
+def report_fit(results, phases, flag=QUADRATIC):
+    """Print the fitted exponent of every phase, return the phases flagged as quadratic or worse"""
+    flagged = []
+    for phase in phases:
+        exponent = fit_exponent(results[phase])
+        if exponent is None:
+            print('%-12s not enough measurements to fit' % phase)
+            continue
+        worse = exponent >= flag
+        print('%-12s ~ O(n^%.2f)%s' % (phase, exponent, '  QUADRATIC OR WORSE' if worse else ''))
+        if worse:
+            flagged.append(phase)
+    return flagged
+
+
+def _time_phases(module, filename, phases, quiet):
+    timings = {}
+    with bench.silenced(quiet):
+        s = time.perf_counter()
+        data = module.read_input(filename)
+        timings['read_input'] = time.perf_counter() - s
+        state = ()
+        if hasattr(module, 'shared_state'):  # the parts need it, timed or not
+            s = time.perf_counter()
+            state = (module.shared_state(data), )
+            timings['shared_state'] = time.perf_counter() - s
+        for phase in bench.PHASES[1:]:
+            if phase not in phases:
+                continue
+            func = getattr(module, phase)
+            s = time.perf_counter()
+            func(data, *state)
+            timings[phase] = time.perf_counter() - s
+    return {phase: timings[phase] for phase in phases}
@@ -0,0 +1,83 @@
+import contextlib
+import importlib
+import io
+import os
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+
+# days known to take the longest; 09 only because of its 100x part 2
+SLOW_DAYS = ('15', '22', '23', '24', '09')
+SLOW_DAY_COST_NS = 10 * 10**9
+
+
+def available_days():
+    return sorted(d for d in os.listdir('.') if d.isdigit() and os.path.isfile(os.path.join(d, 'solution.py')))
+
+
+def parse_days(spec):
+    """Expand a day selection like 'all', '7', '1-12' or '3,5,20-25' to sorted day names"""
+    if spec in (None, 'all'):
+        return available_days()
+    days = set()
+    for part in spec.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            days.update('%02d' % d for d in range(int(first), int(last) + 1))
+        else:
+            days.add('%02d' % int(part))
+    return sorted(days)
+
+
+def order_by_cost(days, baselines):
+    """Most expensive days first, using baseline timings when there are any"""
+    def cost(day):
+        if day in baselines:
+            return sum(phase['median_ns'] for phase in baselines[day]['phases'].values())
+        return SLOW_DAY_COST_NS if day in SLOW_DAYS else 0
+
+    return sorted(days, key=lambda day: (-cost(day), day))
+
+
+def run_parallel(days, func, order, workers=None):
+    """Run func(day) for every day in a process pool, submitting in `order`
+
+    Yields (day, output, elapsed, error) in day order, each as soon as it and all earlier days are done.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {day: executor.submit(_capture, func, day) for day in order}
+        for day in sorted(days):
+            yield (day, ) + futures[day].result()
+
+
+def run_parts(day, data, parts=('solution1', 'solution2')):
+    """Solve the parts of a day at the same time, each in its own worker process that gets a pickled copy of data
+
+    Returns {part: (answer, elapsed, output)}; an exception of a part is raised again here.
+    """
+    with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+        futures = {part: executor.submit(_solve_part, day, part, data) for part in parts}
+        return {part: future.result() for part, future in futures.items()}
+
+
+def _solve_part(day, part, data):
+    module = importlib.import_module('%s.solution' % day)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        s = time.perf_counter()
+        answer = getattr(module, part)(data)
+        elapsed = time.perf_counter() - s
+    return answer, elapsed, out.getvalue()
+
+
+def _capture(func, day):
+    out = io.StringIO()
+    error = None
+    s = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        try:
+            func(day)
+        except Exception:
+            error = traceback.format_exc()
+    return out.getvalue(), time.perf_counter() - s, error
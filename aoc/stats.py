@@ -0,0 +1,42 @@
+from collections import Counter
+
+# switched on by run.py --stats before a day runs; solvers bind their hot functions through
+# counted() when a search starts, so with stats off they run the original functions untouched
+enabled = False
+counters = Counter()
+
+
+def counted(func, name):
+    """func itself when stats are off, else a wrapper counting its calls as `name`"""
+    if not enabled:
+        return func
+
+    def wrapper(*args):
+        counters[name] += 1
+        return func(*args)
+
+    return wrapper
+
+
+def sized(func, container, name, peak):
+    """Like counted(), also keeping the largest len(container) after a call as `peak`"""
+    if not enabled:
+        return func
+
+    def wrapper(*args):
+        counters[name] += 1
+        r = func(*args)
+        if len(container) > counters[peak]:
+            counters[peak] = len(container)
+        return r
+
+    return wrapper
+
+
+def reset():
+    counters.clear()
+
+
+def report(name):
+    if counters:
+        print('Stats for %s: %s' % (name, ', '.join('%s=%d' % item for item in sorted(counters.items()))))
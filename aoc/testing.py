@@ -0,0 +1,93 @@
+import contextlib
+import glob
+import importlib
+import io
+import os
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+
+from aoc import cache
+
+PASSED, FAILED, SKIPPED = 'passed', 'failed', 'skipped'
+LIBRARY = 'aoc'  # stands in for the day of the aoc module tests
+
+
+def discover(days, library=False):
+    """(day, name) of every test function (named test_*) defined in the solution modules of `days`
+
+    With `library` the tests of the aoc modules follow as (LIBRARY, 'module.name').
+    """
+    tests = []
+    for day in days:
+        tests.extend((day, name) for name in _test_names('%s.solution' % day))
+    if library:
+        for path in sorted(glob.glob(os.path.join('aoc', '*.py'))):
+            module = os.path.splitext(os.path.basename(path))[0]
+            tests.extend((LIBRARY, '%s.%s' % (module, name)) for name in _test_names('aoc.%s' % module))
+    return tests
+
+
+def passed_before(day):
+    passed = cache.load(_day_key(day), 'tests')
+    return {} if passed is cache.MISSING else passed
+
+
+def run(tests, workers=None, use_cache=True):
+    """Run tests in a process pool, yield (day, name, status, elapsed, output) in the order of `tests`
+
+    Tests that passed since their day's key last changed are skipped (elapsed is then the time of that pass);
+    a day's passes are recorded as soon as all of its tests are done.
+    """
+    passed = {day: passed_before(day) if use_cache else {} for day, _ in tests}
+    remaining = {}
+    for day, name in tests:
+        remaining[day] = remaining.get(day, 0) + 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            (day, name): executor.submit(_run_test, day, name)
+            for day, name in tests if name not in passed[day]
+        }
+        for day, name in tests:
+            if (day, name) in futures:
+                status, elapsed, output = futures[day, name].result()
+                if status == PASSED:
+                    passed[day][name] = elapsed
+            else:
+                status, elapsed, output = SKIPPED, passed[day][name], ''
+            remaining[day] -= 1
+            if use_cache and not remaining[day]:
+                cache.store(_day_key(day), 'tests', passed[day])
+            yield day, name, status, elapsed, output
+
+
+def _test_names(module_name):
+    module = importlib.import_module(module_name)
+    return [
+        name for name, func in sorted(vars(module).items())
+        if name.startswith('test_') and callable(func) and getattr(func, '__module__', None) == module_name
+    ]
+
+
+def _day_key(day):
+    # for LIBRARY neither file exists, the key is that of the aoc sources alone
+    return cache.day_key(day, '%s/input.txt' % day)
+
+
+def _run_test(day, name):
+    if day == LIBRARY:
+        module_name, name = name.split('.')
+        module = importlib.import_module('aoc.%s' % module_name)
+    else:
+        module = importlib.import_module('%s.solution' % day)
+    out = io.StringIO()
+    status = PASSED
+    s = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        try:
+            getattr(module, name)()
+        except Exception:
+            status = FAILED
+            print(traceback.format_exc(), end='')
+    return status, time.perf_counter() - s, out.getvalue()
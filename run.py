@@ -1,43 +1,473 @@
+import argparse
 import importlib
+import json
+import os
 import sys
 import time
 
+from functools import partial
 
-def main():
-    day = sys.argv[1]
+from aoc import baseline, batch, bench, budget, cache, daemon, imports, memory, profiling, scaling, scheduler, stats, testing
+
+PARTS = (1, 2)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    return _solve(argv)
+
+
+def _solve(argv):
+    parser = argparse.ArgumentParser(prog='run.py', description='Test and solve one day')
+    parser.add_argument('day')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and don\'t update cached inputs and answers')
+    parser.add_argument(
+        '--profile', nargs='?', const=profiling.PROFILE_DIR, metavar='DIR',
+        help='profile each phase, write pstats and collapsed stacks to DIR (default: %s)' % profiling.PROFILE_DIR
+    )
+    parser.add_argument(
+        '--memory', action='store_true',
+        help='report tracemalloc peak, allocated blocks, max RSS growth and top allocation sites per phase '
+             '(tracemalloc slows allocation-heavy phases down considerably)'
+    )
+    parser.add_argument(
+        '--part', type=int, choices=PARTS,
+        help='solve only this part; the common work it builds on (shared_state) is computed or loaded from the cache'
+    )
+    parser.add_argument(
+        '--serial', action='store_true',
+        help='solve the parts one after the other even when the day declares them independent'
+    )
+    parser.add_argument(
+        '--stats', action='store_true',
+        help='count the work the search heavy days do (nodes expanded, heap operations, rounds) per phase'
+    )
+    parser.add_argument(
+        '--budget', metavar='SECONDS',
+        help="time budget per phase, e.g. '30' or 'solution2=60'; the day runs in a worker process that is "
+             "stopped when a phase runs out of time, reporting how far it got"
+    )
+    args = parser.parse_args(argv)
+    stats.enabled = args.stats
+    solve = partial(
+        solve_day,
+        _day(args.day),
+        use_cache=not (args.no_cache or args.profile or args.memory or args.stats),
+        profile_dir=args.profile,
+        memory_report=args.memory,
+        parallel_parts=not args.serial,
+        parts=(args.part, ) if args.part else PARTS
+    )
+    if not args.budget:
+        return solve()
+    try:
+        budgets = budget.parse(args.budget, bench.ALL_PHASES)
+    except ValueError as e:
+        parser.error('invalid --budget %r: %s' % (args.budget, e))
+    exitcode = budget.run(partial(solve, guarded=True), budgets)
+    if exitcode:
+        sys.exit(1)
+
+
+def solve_day(
+    day, use_cache=True, profile_dir=None, memory_report=False, guarded=False, parallel_parts=False, parts=PARTS
+):
+    s = time.perf_counter()
     module = importlib.import_module('%s.solution' % day)
+    print('Time for import: %f seconds' % (time.perf_counter() - s))
+    filename = _input_path(day)
+
+    def wrap(func):
+        if profile_dir:
+            func = profiling.profiled(func, day, profile_dir)
+        if guarded:
+            func = budget.guarded(func)
+        return func
+
+    read_input = wrap(module.read_input)
+    solutions = {n: wrap(getattr(module, 'solution%d' % n)) for n in parts}
+    # the only dependency between parts: days whose parts build on common work declare it as shared_state(data),
+    # it is computed once (or loaded from the cache) before the first requested part and passed to it
+    shared_state = wrap(module.shared_state) if hasattr(module, 'shared_state') else None
+    key = cache.day_key(day, filename) if use_cache else None
+    if key:
+        answers = [cache.load(key, 'answer%d' % n) for n in parts]
+        if cache.MISSING not in answers:
+            for n, answer in zip(parts, answers):
+                print('Answer %d: %s (cached)' % (n, str(answer)))
+            return
+
     if hasattr(module, 'test_read_input'):
         print('Testing input processing...')
         module.test_read_input()
         print('Success')
 
-    data = module.read_input('%s/input.txt' % day)
+    if key:
+        data = cache.cached(key, 'input', partial(_timeit, read_input, filename))
+    else:
+        data = _timeit(read_input, filename, memory_report=memory_report)
 
-    if hasattr(module, 'test_solution1'):
-        print('Testing solution1...')
-        module.test_solution1()
-        print('Success')
-    print('Answer 1: %s' % str(_timeit(module.solution1, data)))
+    # days declaring INDEPENDENT_PARTS share nothing but the input between their parts
+    parallel = (
+        parallel_parts and len(parts) > 1 and getattr(module, 'INDEPENDENT_PARTS', False) and not shared_state and
+        not (profile_dir or memory_report or guarded or stats.enabled)
+    )
+    if parallel:
+        for n, answer in zip(parts, _solve_parts(module, day, data)):
+            if key:
+                cache.store(key, 'answer%d' % n, answer)
+        return
+
+    state = ()
+    for n in parts:
+        test = getattr(module, 'test_solution%d' % n, None)
+        if test:
+            print('Testing solution%d...' % n)
+            test()
+            print('Success')
+        if shared_state and not state:
+            if key:
+                state = (cache.cached(key, 'shared_state', partial(_timeit, shared_state, data)), )
+            else:
+                state = (_timeit(shared_state, data, memory_report=memory_report), )
+        answer = _timeit(solutions[n], data, *state, memory_report=memory_report)
+        print('Answer %d: %s' % (n, str(answer)))
+        if key:
+            cache.store(key, 'answer%d' % n, answer)
+
+
+def _solve_parts(module, day, data):
+    for part in ('solution1', 'solution2'):
+        if hasattr(module, 'test_' + part):
+            print('Testing %s...' % part)
+            getattr(module, 'test_' + part)()
+            print('Success')
+    s = time.perf_counter()
+    results = scheduler.run_parts(day, data)
+    elapsed = time.perf_counter() - s
+    answers = []
+    for n, part in enumerate(('solution1', 'solution2'), start=1):
+        answer, part_elapsed, output = results[part]
+        print(output, end='')
+        print('Time for %s: %f seconds' % (part, part_elapsed))
+        print('Answer %d: %s' % (n, str(answer)))
+        answers.append(answer)
+    print('Time for both parts in parallel: %f seconds' % elapsed)
+    return answers
+
+
+def _all(argv):
+    parser = argparse.ArgumentParser(prog='run.py all', description='Test and solve several days in parallel')
+    parser.add_argument('days', nargs='?', default='all', help="'all' (default), '1-12', '3,5,20-25'")
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: number of CPUs)')
+    parser.add_argument('--no-cache', action='store_true', help='ignore and don\'t update cached inputs and answers')
+    args = parser.parse_args(argv)
+
+    days = scheduler.parse_days(args.days)
+    order = scheduler.order_by_cost(days, baseline.load())
+    s = time.perf_counter()
+    failed = []
+    solve = partial(solve_day, use_cache=not args.no_cache, parallel_parts=False)
+    for day, output, elapsed, error in scheduler.run_parallel(days, solve, order, args.jobs):
+        print('===== Day %s (%f seconds) =====' % (day, elapsed))
+        print(output, end='')
+        if error:
+            print(error, end='')
+            failed.append(day)
+    print('Solved %d day(s) in %f seconds' % (len(days) - len(failed), time.perf_counter() - s))
+    if failed:
+        print('Failed: %s' % ', '.join(failed))
+        sys.exit(1)
+
+
+def _test(argv):
+    parser = argparse.ArgumentParser(
+        prog='run.py test',
+        description='Run the test functions of several days in parallel, skipping the ones that passed before'
+    )
+    parser.add_argument('days', nargs='?', default='all', help="'all' (default), '1-12', '3,5,20-25'")
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: number of CPUs)')
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='run the tests that passed before too, and don\'t record the passes'
+    )
+    args = parser.parse_args(argv)
+
+    s = time.perf_counter()
+    counts = {testing.PASSED: 0, testing.FAILED: 0, testing.SKIPPED: 0}
+    # the tests of the aoc modules run along with all days
+    tests = testing.discover(scheduler.parse_days(args.days), library=args.days == 'all')
+    for day, name, status, elapsed, output in testing.run(tests, args.jobs, use_cache=not args.no_cache):
+        counts[status] += 1
+        label = day if day == testing.LIBRARY else 'Day %s' % day
+        if status == testing.SKIPPED:
+            print('%s %s: skipped, passed in %f seconds' % (label, name, elapsed))
+            continue
+        print('%s %s: %s in %f seconds' % (label, name, status, elapsed))
+        if status == testing.FAILED:
+            print(output, end='')
+    print(
+        '%d passed, %d failed, %d skipped in %f seconds' % (
+            counts[testing.PASSED],
+            counts[testing.FAILED],
+            counts[testing.SKIPPED],
+            time.perf_counter() - s
+        )
+    )
+    if counts[testing.FAILED]:
+        sys.exit(1)
+
+
+def _serve(argv):
+    parser = argparse.ArgumentParser(
+        prog='run.py serve',
+        description='Keep the day modules imported in a pool of workers and solve requests from a Unix socket'
+    )
+    parser.add_argument('-s', '--socket', default=daemon.SOCKET_PATH, help='default: %s' % daemon.SOCKET_PATH)
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: number of CPUs)')
+    parser.add_argument('days', nargs='?', default='all', help="days to import up front, 'all' (default), '1-12'")
+    args = parser.parse_args(argv)
+
+    daemon.serve(args.socket, args.jobs, scheduler.parse_days(args.days))
 
-    if hasattr(module, 'test_solution2'):
-        print('Testing solution2...')
-        module.test_solution2()
-        print('Success')
-    print('Answer 2: %s' % str(_timeit(module.solution2, data)))
 
+def _client(argv):
+    parser = argparse.ArgumentParser(prog='run.py client', description='Solve a day with a running run.py serve')
+    parser.add_argument('day')
+    parser.add_argument('--part', type=int, choices=PARTS, help='solve only this part')
+    parser.add_argument('-i', '--input', help='input file as seen by the daemon (default: the day\'s input.txt)')
+    parser.add_argument('--stdin', action='store_true', help='send the input read from standard input')
+    parser.add_argument('-s', '--socket', default=daemon.SOCKET_PATH, help='default: %s' % daemon.SOCKET_PATH)
+    parser.add_argument('--json', action='store_true', help='print the response as it was received')
+    args = parser.parse_args(argv)
 
-def _timeit(func, *args, **kwargs):
-    s = time.time()
-    r = func(*args, **kwargs)
-    e = time.time()
+    payload = {'day': args.day, 'part': args.part}
+    if args.stdin:
+        payload['contents'] = sys.stdin.read()
+    elif args.input:
+        payload['input'] = os.path.abspath(args.input)
+    try:
+        response = daemon.request(payload, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print('No daemon listening on %s, start one with python run.py serve' % args.socket)
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(response))
+    else:
+        for phase, elapsed in response.get('timings', {}).items():
+            print('Time for %s: %f seconds' % (phase, elapsed))
+        for part, answer in sorted(response.get('answers', {}).items()):
+            print('Answer %s: %s%s' % (part, answer, ' (cached)' if response['cached'] else ''))
+    if response['error']:
+        print(response['error'])
+        sys.exit(1)
+
+
+def _batch(argv):
+    parser = argparse.ArgumentParser(
+        prog='run.py batch',
+        description='Solve one day for every input in a directory or glob, one JSON line per input'
+    )
+    parser.add_argument('day')
+    parser.add_argument('inputs', help='directory or glob pattern of input files')
+    parser.add_argument('-j', '--jobs', type=int, help='worker processes (default: number of CPUs)')
+    parser.add_argument('-o', '--output', help='JSONL file (default: standard output)')
+    args = parser.parse_args(argv)
+
+    day = _day(args.day)
+    if not os.path.isfile('%s/solution.py' % day):
+        parser.error('no solution for day %s' % day)
+    out = open(args.output, 'w') if args.output else sys.stdout
+    failed = 0
+    try:
+        for record in batch.run(day, batch.input_files(args.inputs), args.jobs):
+            out.write(json.dumps(record, default=str) + '\n')
+            out.flush()
+            failed += record['error'] is not None
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if failed:
+        sys.exit(1)
+
+
+def _imports(argv):
+    parser = argparse.ArgumentParser(
+        prog='run.py imports',
+        description='Report the import time of day modules, each in a fresh interpreter'
+    )
+    parser.add_argument('days', nargs='?', default='all', help="'all' (default), '1-12', '3,5,20-25'")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for day in scheduler.parse_days(args.days):
+        try:
+            cumulative, direct_imports = imports.import_time(day)
+        except ImportError as e:
+            print(e)
+            continue
+        rows.append((day, cumulative, direct_imports))
+    imports.report(rows)
+
+
+def _bench(argv):
+    parser = argparse.ArgumentParser(prog='run.py bench', description='Benchmark the phases of one day')
+    parser.add_argument('day')
+    parser.add_argument('-w', '--warmup', type=int, default=1, help='untimed runs before sampling')
+    parser.add_argument('-n', '--repeat', type=int, default=10, help='number of timed runs')
+    parser.add_argument('-o', '--output', help='JSON record file (default: bench_<day>.json)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='keep the solvers\' own output')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    day = _day(args.day)
+    module = importlib.import_module('%s.solution' % day)
+    samples = bench.measure(module, _input_path(day), args.warmup, args.repeat, quiet=not args.verbose)
+    record = bench.make_record(day, samples, args.warmup)
+    bench.report(record)
+    output = args.output or 'bench_%s.json' % day
+    bench.write_record(record, output)
+    print('Record written to %s' % output)
+
+
+def _baseline(argv):
+    parser = argparse.ArgumentParser(prog='run.py baseline', description='Store baseline timings and peak memory')
+    parser.add_argument('days', nargs='+')
+    parser.add_argument('-w', '--warmup', type=int, default=1, help='untimed runs before sampling')
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of timed runs')
+    parser.add_argument('-f', '--file', default=baseline.BASELINE_FILE, help='baseline file')
+    args = parser.parse_args(argv)
+
+    baselines = baseline.load(args.file)
+    for day in args.days:
+        day = _day(day)
+        baselines[day] = _measure_baseline(day, args.warmup, args.repeat)
+        print('Baseline stored for day %s' % day)
+        baseline.save(baselines, args.file)  # keep finished days if a later one fails
+
+
+def _compare(argv):
+    parser = argparse.ArgumentParser(
+        prog='run.py compare',
+        description='Re-measure days and fail when a phase is slower than its baseline'
+    )
+    parser.add_argument('days', nargs='*', help='days to check (default: every day with a baseline)')
+    parser.add_argument('-t', '--threshold', type=float, default=20.0, help='allowed slowdown in percent')
+    parser.add_argument('-m', '--memory-threshold', type=float, help='allowed peak memory growth in percent')
+    parser.add_argument('-w', '--warmup', type=int, default=1, help='untimed runs before sampling')
+    parser.add_argument('-n', '--repeat', type=int, default=5, help='number of timed runs')
+    parser.add_argument('-f', '--file', default=baseline.BASELINE_FILE, help='baseline file')
+    args = parser.parse_args(argv)
+
+    baselines = baseline.load(args.file)
+    days = [_day(day) for day in args.days] or sorted(baselines)
+    regressions = 0
+    for day in days:
+        if day not in baselines:
+            print('Day %s: no baseline, skipped' % day)
+            continue
+        current = _measure_baseline(day, args.warmup, args.repeat)
+        rows = baseline.compare(baselines[day], current, args.threshold, args.memory_threshold)
+        baseline.report(day, rows)
+        regressions += sum(1 for row in rows if row['regressed'])
+    if regressions:
+        print('%d phase(s) regressed' % regressions)
+        sys.exit(1)
+
+
+def _measure_baseline(day, warmup, repeat):
+    module = importlib.import_module('%s.solution' % day)
+    filename = _input_path(day)
+    samples = bench.measure(module, filename, warmup, repeat)
+    peaks = bench.measure_peak_memory(module, filename)
+    return baseline.make_entry(bench.make_record(day, samples, warmup), peaks)
+
+
+def _scale(argv):
+    parser = argparse.ArgumentParser(
+        prog='run.py scale',
+        description='Time a day on generated inputs of growing size and fit the complexity exponent'
+    )
+    parser.add_argument('day')
+    parser.add_argument('-s', '--sizes', default='100,200,400,800,1600', help='comma separated input sizes')
+    parser.add_argument(
+        '-p', '--phase', action='append', choices=bench.ALL_PHASES,
+        help='phase to time, can be repeated (default: all)'
+    )
+    parser.add_argument('-n', '--repeat', type=int, default=1, help='runs per size, the fastest one counts')
+    parser.add_argument('-w', '--warmup', type=int, default=1, help='untimed runs on the first size before the sweep')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the input generator')
+    parser.add_argument(
+        '--flag', type=float, default=scaling.QUADRATIC,
+        help='flag phases whose fitted exponent reaches this (default: %s)' % scaling.QUADRATIC
+    )
+    args = parser.parse_args(argv)
+
+    day = _day(args.day)
+    module = importlib.import_module('%s.solution' % day)
+    if not hasattr(module, 'generate_input'):
+        print('Day %s has no input generator' % day)
+        sys.exit(1)
+    sizes = [int(size) for size in args.sizes.split(',')]
+    phases = [phase for phase in bench.phases(module) if phase in (args.phase or bench.ALL_PHASES)]
+
+    results = {phase: [] for phase in phases}
+    scaling.report_header(phases)
+    try:
+        for size, timings in scaling.sweep(module, sizes, phases, args.repeat, args.seed, warmup=args.warmup):
+            scaling.report_row(size, timings, phases)
+            for phase in phases:
+                results[phase].append((size, timings[phase]))
+    except ValueError as e:  # a size the generator can't produce, fit the sizes done so far
+        print('Stopped: %s' % e)
+    scaling.report_fit(results, phases, args.flag)
+
+
+def _timeit(func, *args, memory_report=False, **kwargs):
+    stats.reset()
+    s = time.perf_counter()
+    if memory_report:
+        r, usage = memory.measure(func, *args, **kwargs)
+    else:
+        r = func(*args, **kwargs)
+    e = time.perf_counter()
     print(
         'Time for %s: %f seconds' % (
             func.__name__,
             e - s
         )
     )
+    if memory_report:
+        memory.report(func.__name__, usage)
+    if stats.enabled:
+        stats.report(func.__name__)
     return r
 
 
+def _day(day):
+    return '%02d' % int(day)
+
+
+def _input_path(day):
+    return '%s/input.txt' % day
+
+
+COMMANDS = {
+    'all': _all,
+    'bench': _bench,
+    'imports': _imports,
+    'scale': _scale,
+    'baseline': _baseline,
+    'batch': _batch,
+    'test': _test,
+    'serve': _serve,
+    'client': _client,
+    'compare': _compare,
+}
+
+
 if __name__ == '__main__':
     main()